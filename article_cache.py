@@ -0,0 +1,134 @@
+"""On-disk cache of downloaded Wikipedia pages."""
+
+import hashlib
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+HEADER = struct.Struct('>d')
+# Every cache file starts with the time it was stored.
+LEVEL = 6
+# zlib compression level of the pages.
+
+
+def normalise_title(title):
+    """Reduce a page title to the form used for cache keys"""
+    return '_'.join(title.strip().lower().replace('_', ' ').split())
+
+
+class ArticleCache:
+    """
+    A size-bounded LRU cache of compressed pages, shared between games.
+
+    Entries are keyed on (wiki mode, normalised title). Each one is a single
+    zlib-compressed file, so several processes can safely share a directory.
+    The file modification time is used as the last access time.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 2 ** 20, ttl=7 * 24 * 3600):
+        """Initialise the parameters"""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.entries = OrderedDict()
+        # File name -> size on disk, least recently used first.
+        self.total_bytes = 0
+        self.load_entries()
+
+    def load_entries(self):
+        """Rebuild the LRU order from the files already on disk"""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.z'):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self.entries[name] = size
+            self.total_bytes += size
+
+    def file_name(self, mode, title):
+        """Get the cache file name for a page"""
+        key = '{}:{}'.format(mode, normalise_title(title))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest() + '.z'
+
+    def get(self, mode, title):
+        """Return the cached page bytes, or None on a miss"""
+        name = self.file_name(mode, title)
+        path = os.path.join(self.directory, name)
+        with self.lock:
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                stored, = HEADER.unpack_from(raw)
+                data = zlib.decompress(raw[HEADER.size:])
+            except (OSError, struct.error, zlib.error):
+                self.discard(name)
+                self.misses += 1
+                return None
+
+            if time.time() - stored > self.ttl:
+                self.discard(name)
+                self.misses += 1
+                return None
+
+            # Mark as recently used.
+            os.utime(path)
+            self.total_bytes += len(raw) - self.entries.get(name, 0)
+            # New to this cache if another process wrote it.
+            self.entries[name] = len(raw)
+            self.entries.move_to_end(name)
+            self.evict()
+            self.hits += 1
+            return data
+
+    def put(self, mode, title, data):
+        """Store page bytes in the cache"""
+        self.put_compressed(mode, title, zlib.compress(data, LEVEL))
+
+    def put_compressed(self, mode, title, compressed):
+        """Store page bytes that have already been compressed with zlib"""
+        name = self.file_name(mode, title)
+        path = os.path.join(self.directory, name)
+        raw = HEADER.pack(time.time()) + compressed
+        with self.lock:
+            temp = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+            with open(temp, 'wb') as f:
+                f.write(raw)
+            os.replace(temp, path)
+            # Write then rename so readers never see half a file.
+
+            self.total_bytes -= self.entries.pop(name, 0)
+            self.entries[name] = len(raw)
+            self.total_bytes += len(raw)
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used pages until under the size limit"""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            name = next(iter(self.entries))
+            self.discard(name)
+
+    def discard(self, name):
+        """Remove one file from the cache"""
+        self.total_bytes -= self.entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def stats(self):
+        """Return the cache counters"""
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes}
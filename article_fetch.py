@@ -0,0 +1,115 @@
+"""Fetch Wikipedia articles in the background."""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from validate_numbers import Validation
+
+
+def split_titles(text, limit=None):
+    """
+    Split a guess like "Ice | Glacier | Antarctica" into lower case titles.
+
+    Blank and repeated titles are dropped and at most `limit` are kept.
+    """
+    titles = []
+    for title in text.split('|'):
+        title = title.strip().lower()
+        if title and title not in titles:
+            titles.append(title)
+    return titles[:limit]
+
+
+def fetch_article(title, mode_choice=0, **options):
+    """Download and tokenise an article, returning the Validation"""
+    validation = Validation(title, **options)
+    validation.scrape_wiki(mode_choice)
+    validation.process_wiki()
+    return validation
+
+
+class FetchResult:
+    """The outcome of one background fetch."""
+
+    def __init__(self, title, validation=None, error=None, span=None):
+        self.title = title
+        self.validation = validation
+        self.error = error
+        self.span = span
+
+    @property
+    def found(self):
+        """True if the article was fetched and tokenised."""
+        return self.error is None
+
+    @property
+    def token(self):
+        """The article tokens, or an empty list if it wasn't found."""
+        if self.validation is None or self.validation.token is None:
+            return []
+        return self.validation.token
+
+    def count_words(self, index):
+        """Count the article words that are on the board"""
+        if self.validation is None:
+            return Counter()
+        return self.validation.count_words(index)
+
+
+class ArticleFetcher:
+    """
+    Run article fetches on a worker pool so the game loop never blocks.
+
+    Results are handed back by `poll` in the order the titles were
+    submitted, so the board is always updated deterministically. If
+    `notify` is given it's called from the worker thread as each fetch
+    finishes, so the game can sleep until there's something to poll.
+    """
+
+    def __init__(self, max_workers=2, fetch=fetch_article, notify=None):
+        """Initialise the parameters"""
+        self.fetch = fetch
+        self.notify = notify
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='fetch')
+        self.pending = []
+        # (title, future, span) in submission order.
+
+    @property
+    def busy(self):
+        """True while any submitted fetch hasn't been collected."""
+        return len(self.pending) > 0
+
+    def submit(self, title, *args, **kwargs):
+        """Start fetching an article in the background."""
+        future = self.executor.submit(self.fetch, title, *args, **kwargs)
+        return self.adopt(title, future, kwargs.get('span'))
+
+    def adopt(self, title, future, span=None):
+        """Queue a fetch that was started elsewhere, e.g. by the Prefetcher."""
+        self.pending.append((title, future, span))
+        if self.notify is not None:
+            future.add_done_callback(lambda _: self.notify())
+        return future
+
+    def poll(self):
+        """Return the finished fetches at the head of the queue."""
+        results = []
+        while self.pending and self.pending[0][1].done():
+            title, future, span = self.pending.pop(0)
+            try:
+                results.append(FetchResult(title, validation=future.result(), span=span))
+            except Exception as err:
+                results.append(FetchResult(title, error=err, span=span))
+        return results
+
+    def cancel_all(self):
+        """Drop every in-flight fetch, their results will never be seen."""
+        for _, future, _ in self.pending:
+            future.cancel()
+        self.pending = []
+
+    def shutdown(self):
+        """Cancel everything and stop the worker threads."""
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
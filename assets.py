@@ -0,0 +1,58 @@
+"""Load files used for drawing once and keep them until they change."""
+
+import os
+import time
+
+
+class AssetManager:
+    """
+    Hold the loaded form of files, e.g. images or rendered text.
+
+    Each asset is a file path and a function that loads it. The loaded value
+    is kept and only loaded again when the file's modification time changes
+    or the asset is invalidated. Modification times are checked at most once
+    every check_interval seconds, so asking for an asset every frame is cheap.
+    """
+
+    def __init__(self, check_interval=1.0):
+        """Initialise the parameters"""
+        self.check_interval = check_interval
+        self.assets = {}
+        self.loads = 0
+
+    def register(self, name, path, load):
+        """Add an asset that is loaded by calling load(path)"""
+        self.assets[name] = {'path': path, 'load': load,
+                             'value': None, 'mtime': None, 'checked': None}
+
+    def get(self, name):
+        """Return the loaded asset, loading it again if the file has changed"""
+        asset = self.assets[name]
+        now = time.monotonic()
+        if asset['checked'] is not None and now - asset['checked'] < self.check_interval:
+            return asset['value']
+        asset['checked'] = now
+
+        try:
+            mtime = os.stat(asset['path']).st_mtime_ns
+        except OSError:
+            mtime = None
+            # Missing files are loaded too, the loader decides what that means.
+        if asset['value'] is None or mtime != asset['mtime']:
+            asset['value'] = asset['load'](asset['path'])
+            asset['mtime'] = mtime
+            self.loads += 1
+        return asset['value']
+
+    def refresh(self):
+        """Check every asset, returning True if any were loaded again"""
+        loads = self.loads
+        for name in self.assets:
+            self.get(name)
+        return self.loads != loads
+
+    def invalidate(self, name):
+        """Load the asset again the next time it's used"""
+        asset = self.assets[name]
+        asset['value'] = None
+        asset['checked'] = None
@@ -0,0 +1,60 @@
+"""Time drawing the main screen of a 7x7 game, redrawing everything or only what changed."""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import game  # noqa: E402
+from pygame_textinput import TextInput  # noqa: E402
+
+FRAMES = 300
+
+
+def setup():
+    """Create a game part way through a 7x7 board"""
+    instance = game.Game()
+    instance.board_size = 7
+    instance.engine = game.BingoEngine(game.all_words(), 7)
+    instance.buttons = {'restart': game.Button('RESTART', game.TEXTCOLOR, game.TILECOLOR,
+                                               game.WINDOWWIDTH - 150, 30)}
+    instance.textinput = TextInput(text_color=game.TEXTCOLOR, cursor_color=game.TEXTCOLOR)
+    instance.engine.message_array = ['ice:', 'water: 3', 'cold: 1']
+    instance.engine.score = 2
+    return instance
+
+
+def run(instance, full):
+    """Draw frames while the player types, with a guess landing every 30 frames"""
+    instance.full_redraw = True
+    instance.draw_main_screen()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        instance.textinput.update([])
+        if frame % 30 == 0:
+            instance.engine.board_counts[frame // 30 % 7][0] += 1
+            instance.engine.message_array = ['guess {}:'.format(frame)]
+        instance.full_redraw = full
+        instance.draw_main_screen()
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    pygame.init()
+    instance = setup()
+    for name, full in [('full', True), ('dirty', False)]:
+        game.TEXT_CACHE.clear()
+        elapsed = run(instance, full)
+        print('{:>6}: {:6.3f} ms per frame'.format(name, elapsed * 1000))
+    instance.fetcher.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Measure index build time, lookup latency and memory of the dump backend."""
+
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wiki_dump  # noqa: E402
+
+
+def page_text(i, rng):
+    words = ['ice', 'snow', 'germany', 'river', 'history', 'city', 'music', 'science']
+    return ' '.join(rng.choice(words) for _ in range(600)) + ' [[Page {}]]'.format(i)
+
+
+def rss_mb():
+    """Current resident memory, or the peak where /proc isn't available"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(pages=50000, lookups=500):
+    rng = random.Random(0)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'bench-pages-articles-multistream.xml.bz2')
+        wiki_dump.write_dump(path, (('Page {}'.format(i), page_text(i, rng))
+                                    for i in range(pages)))
+        print('dump: {} pages, {:.1f} MB'.format(pages, os.path.getsize(path) / 2 ** 20))
+
+        start = time.perf_counter()
+        wiki_dump.build_index(path, path + '.idx')
+        print('index: {:.1f} s to build, {:.2f} MB'.format(
+            time.perf_counter() - start, os.path.getsize(path + '.idx') / 2 ** 20))
+
+        rss_before = rss_mb()
+        dump = wiki_dump.WikiDump(path)
+        times = []
+        for _ in range(lookups):
+            title = 'Page {}'.format(rng.randrange(pages))
+            start = time.perf_counter()
+            dump.get_page(title)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print('lookup: median {:.2f} ms, p99 {:.2f} ms'.format(
+            times[len(times) // 2] * 1000, times[int(len(times) * 0.99)] * 1000))
+        print('rss: {:.1f} MB before opening, {:.1f} MB after lookups'.format(
+            rss_before, rss_mb()))
+        dump.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Compare peak memory and time of soup and streaming extraction."""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import large_page  # noqa: E402
+from html_stream import iter_chunks, stream_tokens  # noqa: E402
+from validate_numbers import Validation  # noqa: E402
+
+
+def soup_tokens(data):
+    val = Validation('page', tokenizer='fast')
+    val.parse_page(data)
+    val.process_wiki()
+    return val.token
+
+
+def streamed_tokens(data):
+    return stream_tokens(iter_chunks(data))
+
+
+def measure(extract, data):
+    """Return (tokens, seconds, peak MB) for one extraction"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = extract(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(tokens), elapsed, peak / 2 ** 20
+
+
+def main():
+    data = large_page()
+    print('page: {:.1f} MB'.format(len(data) / 2 ** 20))
+    for name, extract in [('soup', soup_tokens), ('stream', streamed_tokens)]:
+        count, elapsed, peak = measure(extract, data)
+        print('{:>7}: {:>8} tokens {:7.2f} s  peak {:7.1f} MB'.format(name, count, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
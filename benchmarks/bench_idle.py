@@ -0,0 +1,49 @@
+"""Measure the CPU used by the main screen while nobody is playing."""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import game  # noqa: E402
+
+SECONDS = 5
+
+
+def idle(seconds):
+    """Leave the main screen alone for a while, returning the wall and CPU time and draws"""
+    instance = game.Game()
+    draws = []
+    draw = instance.draw_main_screen
+    instance.draw_main_screen = lambda: draws.append(draw())
+    restart = game.Button('RESTART', game.TEXTCOLOR, game.TILECOLOR, game.WINDOWWIDTH - 150, 30)
+    click = pygame.event.Event(pygame.MOUSEBUTTONUP, pos=restart.rect.center, button=1)
+    pygame.time.set_timer(click, int(seconds * 1000), loops=1)
+    # Press restart once the time is up, which leaves the main screen.
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    instance.main_screen()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    instance.fetcher.shutdown()
+    return wall, cpu, len(draws)
+
+
+def main():
+    pygame.init()
+    wall, cpu, draws = idle(0.5)
+    longer_wall, longer_cpu, longer_draws = idle(0.5 + SECONDS)
+    # The difference leaves out setting up the game.
+    seconds = longer_wall - wall
+    print('idle main screen: {:.1%} of a core, {:.1f} draws a second ({} video driver)'.format(
+        (longer_cpu - cpu) / seconds, (longer_draws - draws) / seconds, pygame.display.get_driver()))
+
+
+if __name__ == '__main__':
+    main()
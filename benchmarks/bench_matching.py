@@ -0,0 +1,52 @@
+"""Time matching an article's tokens against a 7x7 board."""
+
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from board import BoardIndex, count_board_words  # noqa: E402
+from word_generation import get_word_list  # noqa: E402
+
+
+def flatten_match(tokens, board_words):
+    """The original per-token scan of the flattened board"""
+    words = [word.lower()
+             for word in tokens
+             if word.lower() in board_words.flatten()]
+    counter = Counter(words)
+    for word in counter:
+        tuple(np.argwhere(board_words == word.lower())[0])
+    return counter
+
+
+def index_match(tokens, index):
+    """Count through the board index"""
+    counter = count_board_words(tokens, index)
+    for word in counter:
+        index[word]
+    return counter
+
+
+def main():
+    rng = np.random.default_rng(0)
+    words = [w for w in get_word_list(os.path.join(ROOT, 'no_stop_g2.txt')) if w]
+    board_words = np.array(rng.choice(words, 49, replace=False), dtype=object).reshape((7, 7))
+    tokens = [str(w) for w in rng.choice(words[:2000], 50000)]
+    index = BoardIndex(board_words)
+
+    for name, match, board in [('flatten', flatten_match, board_words),
+                               ('index', index_match, index)]:
+        start = time.perf_counter()
+        counter = match(tokens, board)
+        elapsed = time.perf_counter() - start
+        print('{:>8}: {:8.2f} ms  ({} board words found)'.format(name, elapsed * 1000, len(counter)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare bytes and latency of the html and wikitext fetch modes."""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'test'))
+
+from http_client import HTTPClient  # noqa: E402
+from validate_numbers import Validation  # noqa: E402
+from wiki_server import StandInWiki  # noqa: E402
+
+
+def read_page(name):
+    with open(os.path.join(ROOT, 'test', 'pages', name), 'rb') as f:
+        return f.read()
+
+
+def run(wiki, source, repeat=20):
+    """Fetch and tokenise the page repeatedly, returning the stats"""
+    client = HTTPClient()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        val = Validation('Ice', client=client, tokenizer='fast', source=source)
+        val.modes = [wiki.url + '/wiki/']
+        val.raw_modes = [wiki.url + '/w/index.php?action=raw&title=']
+        val.scrape_wiki()
+        val.process_wiki()
+    elapsed = (time.perf_counter() - start) / repeat
+    client.close()
+    stats = client.stats()
+    return (stats['bytes_on_wire'] / repeat, stats['bytes_decoded'] / repeat,
+            elapsed, len(val.token))
+
+
+def main():
+    pages = {'/wiki/Ice': read_page('ice.html'),
+             '/w/index.php?action=raw&title=Ice': read_page('ice.wiki')}
+    with StandInWiki(pages) as wiki:
+        for source in ['html', 'raw']:
+            wire, decoded, elapsed, tokens = run(wiki, source)
+            print('{:>5}: {:>7.0f} B on wire {:>7.0f} B decoded {:7.2f} ms {:>5} tokens'.format(
+                source, wire, decoded, elapsed * 1000, tokens))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Time starting the game, and fail if it's over budget.
+
+Measures the time from launching python to the first start screen frame
+being drawn, and the total import time of game.py from python -X importtime.
+Exits with status 1 if either is over its budget.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_FRAME_BUDGET = 2.0
+IMPORT_BUDGET = 1.0
+# Seconds, generous enough for a slow machine but well under what eager
+# pandas, bs4 and nltk imports plus the punkt download used to take.
+
+RUNS = 5
+
+FIRST_FRAME = '''
+import pygame
+pygame.init()
+import game
+
+def draw_once(self, draw=game.Game.draw_start_screen):
+    draw(self)
+    self.loop_stage = False
+
+game.Game.draw_start_screen = draw_once
+instance = game.Game()
+instance.start_screen()
+print('FIRST FRAME', flush=True)
+instance.fetcher.shutdown()
+'''
+
+
+def environment():
+    """Run pygame without a window"""
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    return env
+
+
+def time_to_first_frame():
+    """Seconds from launching python to the first frame being drawn"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', FIRST_FRAME], cwd=ROOT,
+                               env=environment(), stdout=subprocess.PIPE)
+    for line in process.stdout:
+        if line.startswith(b'FIRST FRAME'):
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError('The game exited before drawing a frame')
+    process.wait()
+    return elapsed
+
+
+def import_time(module='game'):
+    """Total seconds spent importing a module, and the slowest imports under it"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            cwd=ROOT, env=environment(), stderr=subprocess.PIPE,
+                            stdout=subprocess.DEVNULL, check=True)
+    total = 0
+    imports = []
+    for line in result.stderr.decode().splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        if match:
+            cumulative = int(match.group(2)) / 1e6
+            imports.append((cumulative, match.group(4)))
+            if match.group(4) == module:
+                total = cumulative
+    return total, sorted(imports, reverse=True)
+
+
+def main():
+    frames = sorted(time_to_first_frame() for _ in range(RUNS))
+    imports = sorted(import_time()[0] for _ in range(RUNS))
+    frame, total = frames[RUNS // 2], imports[RUNS // 2]
+
+    print('first frame: {:6.0f} ms  (budget {:.0f} ms)'.format(frame * 1000, FIRST_FRAME_BUDGET * 1000))
+    print('import game: {:6.0f} ms  (budget {:.0f} ms)'.format(total * 1000, IMPORT_BUDGET * 1000))
+    print('slowest imports:')
+    for cumulative, name in import_time()[1][1:11]:
+        print('  {:6.0f} ms  {}'.format(cumulative * 1000, name))
+
+    if frame > FIRST_FRAME_BUDGET or total > IMPORT_BUDGET:
+        print('OVER BUDGET')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Compare the throughput of the NLTK and fast tokenizers."""
+
+import os
+import re
+import sys
+import time
+
+import nltk
+from bs4 import BeautifulSoup as bs
+from nltk.tokenize import NLTKWordTokenizer
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tokenizer  # noqa: E402
+
+
+def nltk_tokenize(text):
+    """Tokenise with NLTK, using an untrained Punkt model if needed"""
+    try:
+        return nltk.word_tokenize(text)
+    except LookupError:
+        sentences = PunktSentenceTokenizer().tokenize(text)
+        words = NLTKWordTokenizer()
+        return [token for sent in sentences for token in words.tokenize(sent)]
+
+
+def load_text():
+    """Join the saved test pages into one long article"""
+    text = []
+    pages = os.path.join(ROOT, 'test', 'pages')
+    for name in sorted(os.listdir(pages)):
+        with open(os.path.join(pages, name), 'rb') as f:
+            text.append(bs(f.read(), 'html.parser').get_text())
+    return re.sub(r'\[(\d+)\]', '', '\n'.join(text).replace('[edit]', ''))
+
+
+def throughput(tokenize, text, repeat=3):
+    """Return the best tokens per second over a few runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = tokenize(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(tokens), len(tokens) / best
+
+
+def main():
+    text = load_text() * 20
+    for name, tokenize in [('nltk', nltk_tokenize), ('fast', tokenizer.word_tokenize)]:
+        count, rate = throughput(tokenize, text)
+        print('{:>5}: {:>8} tokens {:>12,.0f} tokens/sec'.format(name, count, rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""Saved article pages of various sizes for the benchmarks."""
+
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = os.path.join(ROOT, 'test', 'pages')
+
+
+def read_page(name):
+    """Read one of the saved pages"""
+    with open(os.path.join(PAGES, name), 'rb') as f:
+        return f.read()
+
+
+def large_page(megabytes=4):
+    """Build a long "List of..." style page out of the saved pages"""
+    page = read_page('germany.html')
+    head, body = page.split(b'<body>')
+    body, tail = body.split(b'</body>')
+    repeats = int(megabytes * 2 ** 20 / len(body)) + 1
+    return head + b'<body>' + body * repeats + b'</body>' + tail
+
+
+def corpus():
+    """Return {title: html} from a short stub up to a very long list page"""
+    return {'Glacier': read_page('glacier.html'),
+            'Ice': read_page('ice.html'),
+            'Germany': read_page('germany.html'),
+            'List_100k': large_page(0.1),
+            'List_1M': large_page(1)}
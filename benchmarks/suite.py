@@ -0,0 +1,168 @@
+"""
+Time every step from fetching an article to drawing the board, offline.
+
+Articles of various sizes are served by a local stand-in for Wikipedia.
+Results are written as JSON so runs on different commits can be compared:
+
+    python benchmarks/suite.py --output before.json
+    git checkout other-branch
+    python benchmarks/suite.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'test'))
+
+import numpy as np  # noqa: E402
+
+from board import BoardIndex  # noqa: E402
+from corpus import corpus  # noqa: E402
+from http_client import HTTPClient  # noqa: E402
+import validate_numbers  # noqa: E402
+from validate_numbers import Validation  # noqa: E402
+from wiki_server import StandInWiki  # noqa: E402
+from word_generation import get_word_list  # noqa: E402
+
+WORD_FILE = os.path.join(ROOT, 'no_stop_g2.txt')
+
+
+def time_runs(function, repeat):
+    """Run a function repeatedly and summarise the times in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'runs': repeat}
+
+
+def make_validation(wiki, client, title, **options):
+    """A Validation that fetches from the stand-in wiki"""
+    val = Validation(title, client=client, **options)
+    val.modes = [wiki.url + '/wiki/']
+    return val
+
+
+def bench_pages(wiki, pages, board, repeat):
+    """Time scrape_wiki, process_wiki and board matching for every page"""
+    results = {}
+    client = HTTPClient()
+    for title, page in pages.items():
+        size = '{} ({} kB)'.format(title, len(page) // 1024)
+        runs = max(3, repeat if len(page) < 2 ** 20 else repeat // 5)
+
+        # Download and parse the page with BeautifulSoup
+        results['scrape_wiki/' + size] = time_runs(
+            lambda: make_validation(wiki, client, title).scrape_wiki(), runs)
+
+        # Tokenise the page, with each tokenizer
+        for tokenizer in ['nltk', 'fast']:
+            val = make_validation(wiki, client, title, tokenizer=tokenizer)
+            val.scrape_wiki()
+            results['process_wiki/{}/{}'.format(tokenizer, size)] = time_runs(val.process_wiki, runs)
+
+        # Download and tokenise in one go, as the game does
+        results['stream/' + size] = time_runs(
+            lambda: make_validation(wiki, client, title, tokenizer='fast', stream=True).scrape_wiki(),
+            runs)
+
+        # Count the board words in the page
+        results['count_words/' + size] = time_runs(lambda: val.count_words(board), runs)
+    client.close()
+    return results
+
+
+def bench_draw(repeat):
+    """Time drawing the main screen, redrawing everything or only what changed"""
+    import bench_draw
+    import pygame
+    pygame.init()
+    instance = bench_draw.setup()
+    results = {}
+    for name, full in [('full', True), ('dirty', False)]:
+        frames = []
+        for _ in range(max(1, repeat // 10)):
+            frames.append(bench_draw.run(instance, full) * 1000)
+        results['draw_main_screen/' + name] = {'median_ms': statistics.median(frames),
+                                               'min_ms': min(frames),
+                                               'runs': len(frames) * bench_draw.FRAMES}
+    instance.fetcher.shutdown()
+    return results
+
+
+def commit():
+    """The commit being measured"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        return result.stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old_path):
+    """Print how each result changed since an older run"""
+    with open(old_path) as f:
+        old = json.load(f)
+    print('{:45} {:>10} {:>10} {:>7}'.format('compared to ' + str(old.get('commit')),
+                                              'before', 'after', 'ratio'))
+    for name, result in results['results'].items():
+        before = old['results'].get(name)
+        if before is None:
+            continue
+        print('{:45} {:10.3f} {:10.3f} {:7.2f}'.format(name[:45], before['median_ms'],
+                                                     result['median_ms'],
+                                                     result['median_ms'] / before['median_ms']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='an earlier JSON result to compare with')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--no-draw', action='store_true', help="skip the pygame benchmark")
+    args = parser.parse_args()
+
+    results = {}
+    results['get_word_list'] = time_runs(lambda: get_word_list(WORD_FILE), args.repeat)
+
+    rng = np.random.default_rng(0)
+    words = [word for word in get_word_list(WORD_FILE) if word]
+    board = BoardIndex(np.array(rng.choice(words, 49, replace=False), dtype=object).reshape((7, 7)))
+
+    pages = corpus()
+    with StandInWiki({'/wiki/' + title: page for title, page in pages.items()}) as wiki:
+        results.update(bench_pages(wiki, pages, board, args.repeat))
+
+    if not args.no_draw:
+        results.update(bench_draw(args.repeat))
+
+    report = {'commit': commit(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'python': platform.python_version(), 'machine': platform.machine(),
+              'nltk_punkt': validate_numbers.PUNKT_FOUND,
+              'results': results}
+    if not validate_numbers.PUNKT_FOUND:
+        print('NLTK punkt data is missing, process_wiki/nltk used the built in tokenizer')
+    for name, result in results.items():
+        print('{:45} {:10.3f} ms'.format(name, result['median_ms']))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Fast lookups of the words on a Bingo board."""
+
+from collections import Counter
+
+
+class BoardIndex:
+    """
+    Map every word on the board to its tile.
+
+    The index is kept up to date as words are added and replaced, so
+    checking whether a word is on the board never scans the board.
+    """
+
+    def __init__(self, board_words=None):
+        """Initialise the parameters"""
+        self.tiles = {}
+        if board_words is not None:
+            for x, row in enumerate(board_words):
+                for y, word in enumerate(row):
+                    self.tiles[word] = (x, y)
+
+    def __contains__(self, word):
+        return word in self.tiles
+
+    def __getitem__(self, word):
+        return self.tiles[word]
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def add(self, word, x, y):
+        """Put a word on a tile"""
+        self.tiles[word] = (x, y)
+
+    def replace(self, old_word, new_word):
+        """Swap a word on the board for a new one on the same tile"""
+        self.tiles[new_word] = self.tiles.pop(old_word)
+
+
+def count_board_words(tokens, index):
+    """
+    Count the board words in a token stream in a single pass.
+
+    Returns a Counter ordered by each word's first appearance, which is the
+    order the game lists them in when counts are equal.
+    """
+    return Counter(filter(index.tiles.__contains__, map(str.lower, tokens)))
+
@@ -0,0 +1,172 @@
+"""The rules of Wikipedia Bingo, without any drawing."""
+
+import numpy as np
+
+from board import BoardIndex
+from word_generation import WordPool
+
+
+SIZE_POINTS = {3: 2000, 5: 4000, 7: 6000}
+LIMIT_POINTS = {3: 4000, 5: 6000, 7: 8000}
+# Points for the board size and difficulty, divided by the number of guesses.
+
+
+def final_score(board_size, limit, guesses):
+    """Score a win after a number of guesses (works on arrays of guesses too)"""
+    points = SIZE_POINTS.get(board_size, 0) + LIMIT_POINTS.get(limit, 0)
+    return np.floor_divide(points, np.add(guesses, 1))
+
+
+class BingoEngine:
+    """
+    The state of one game and the rules for changing it.
+
+    Holds the board words, counts, limits and which tiles are new, counts
+    articles against the board and works out when the game is won and the
+    final score. Nothing here needs pygame or a window, so games can be
+    played by the pygame front end, tests, servers or simulations alike.
+    """
+
+    def __init__(self, words, board_size=5, limit=5, seed=None):
+        """Initialise the parameters"""
+        self.pool = WordPool(words, seed=seed)
+        # Words not on the board, drawn from with the game's own random numbers.
+        self.seed = seed
+        self.board_size = board_size
+        self.limit = limit
+
+        # Generate a new puzzle
+        self.get_starting_board()
+
+        # Create list of red tiles
+        self.board_counts = np.zeros((self.board_size, self.board_size))
+        self.board_new = np.zeros((self.board_size, self.board_size))
+
+        # Create the message array (starts blank)
+        self.message_array = None
+        self.batch = None
+        # Messages of the articles applied so far in a guess of several, see start_batch.
+
+        # Initial score.
+        self.score = 0
+        self.final_score = None
+
+    def get_starting_board(self):
+        """Fill the board with new words."""
+        words = []
+        ranges = []
+        self.board_index = BoardIndex()
+        for i in range(self.board_size * self.board_size):
+            word, limit = self.get_new_word()
+            self.board_index.add(word, i // self.board_size, i % self.board_size)
+            words.append(word)
+            ranges.append(limit)
+        self.board_words = np.array(words, dtype=object).reshape((self.board_size, self.board_size))
+        self.board_limits = np.array(ranges).reshape((self.board_size, self.board_size))
+
+    def get_new_word(self):
+        """Get an unused word from the list of all words."""
+        return self.pool.draw(), self.limit
+
+    def start_batch(self, titles):
+        """
+        Start a guess of several articles.
+
+        Until the next batch each article's messages are added after the ones
+        before it, instead of replacing them, and new words stay highlighted.
+        """
+        self.message_array = [' | '.join(titles) + ':']
+        self.batch = []
+        self.board_new = np.zeros((self.board_size, self.board_size))
+
+    def apply_counts(self, title, counter, found=True):
+        """
+        Add the board words counted in an article to the board.
+
+        Returns the list of words that were put on the board to replace ones
+        that overflowed.
+        """
+        # Reset the new word counter
+        if self.batch is None:
+            self.board_new = np.zeros((self.board_size, self.board_size))
+
+        # Replace the fetching message
+        self.message_array = [title + ':']
+        if not found:
+            self.message_array.append('Article not found')
+        self.score += 1
+
+        # Create the message for the top left
+        if len(counter) == 0:
+            self.message_array.append('No valid words')
+
+        new_words = []
+        for word in sorted(counter, key=lambda x: counter[x], reverse=True):
+            x, y = self.board_index[word]
+            current_count = self.board_counts[x][y]
+            limit = self.board_limits[x][y]
+            new_count = current_count + counter[word]
+
+            # Create the message array for the left hand courner
+            message = '{} ({:.0f})+{:.0f} = {:.0f}/{:.0f}'.format(word,
+                                                                  current_count,
+                                                                  counter[word],
+                                                                  new_count,
+                                                                  limit)
+            self.message_array.append(message)
+
+            # Check if the counter has overflowed
+            new_word = None
+            new_range = None
+            if new_count >= limit:
+                new_count = 0
+                new_word, new_range = self.get_new_word()
+                self.pool.put_back(word)
+                # After drawing, so the word isn't replaced by itself.
+                self.message_array.append('  OVERFLOW > {}'.format(new_word))
+
+            # Save the new count, new word (if needed) and message
+            self.board_counts[x][y] = new_count
+            if new_word:
+                new_words.append(new_word)
+                self.board_index.replace(word, new_word)
+                self.board_words[x][y] = new_word
+                self.board_limits[x][y] = new_range
+                self.board_new[x][y] = 1
+
+        if self.batch is not None:
+            self.batch += self.message_array
+            self.message_array = list(self.batch)
+        return new_words
+
+    def game_won(self):
+        """Determine if anyone has won the game."""
+        won = False
+
+        # check for winning rows
+        for row in self.board_counts:
+            if all(row > 0):
+                won = True
+
+        # check for winning columns
+        for col in self.board_counts.T:
+            if all(col > 0):
+                won = True
+
+        return won
+
+    def scoring_algorithm(self):
+        """
+        Scores a player's performance
+
+        Parameters
+        ---------
+        N : int
+            number of wiki articles used to win
+        mode : int
+            Either 3, 5 or 7 for Easy, Medium and Hard
+        grid : int
+            Either 3, 5 or 7 for size of grid 3by3, 5by5 and 7by7
+        """
+        self.final_score = int(final_score(self.board_size, self.limit, self.score))
+        return self.final_score
@@ -1,19 +1,43 @@
 """Wikipedia Bingo code."""
 
+import argparse
+import os
+import random
 import sys
-from collections import Counter
-
-import numpy as np
-import pandas as pd
+import time
 
 import pygame
 import pygame.locals as loc
 
+from article_cache import ArticleCache
+
+from article_fetch import ArticleFetcher, split_titles
+
+from assets import AssetManager
+
+from engine import BingoEngine
+
+from http_client import HTTPClient
+
+from leaderboard import Leaderboard
+
+from metrics import MetricsLog, Span
+
+from prefetch import Prefetcher
+
 from pygame_textinput import TextInput
 
-from validate_numbers import Validation
+from render_cache import TextCache
+
+from session import RecordingCache, SessionRecorder
+
+from titles import TitleIndex
+
+from vocab_store import VocabStore
 
-from word_generation import TargetWord, get_word_list
+from wiki_dump import WikiDump
+
+from word_generation import get_word_list
 
 
 # Create the constants (go ahead and experiment with different values)
@@ -24,6 +48,13 @@ TILE_HEIGHT = 80
 WINDOWWIDTH = 1920
 WINDOWHEIGHT = 800
 FPS = 30
+IDLE_MS = 1000
+# Longest the game sleeps for when nothing is happening.
+FETCHED = pygame.event.custom_type()
+# Posted from the fetch threads when an article has been fetched.
+POLLING_DRIVERS = ('dummy', 'offscreen')
+POLL_MS = 1000 // FPS
+# Video drivers that can't sleep until an event arrives, checked once a frame instead.
 BLANK = None
 
 # Colours (R, G, B)
@@ -40,20 +71,92 @@ BUTTONCOLOR = BLACK
 BUTTONTEXTCOLOR = BLACK
 MESSAGECOLOR = BLACK
 
+# Read articles from this dump instead of the network if it's been indexed
+DUMP_FILE = 'enwiki-latest-pages-articles-multistream.xml.bz2'
+
+# Downloaded articles are kept here between games
+CACHE_DIR = 'article_cache'
+CACHE_BYTES = 64 * 2 ** 20
+CACHE_TTL = 7 * 24 * 3600
+
+# Titles allowed in one guess (Ice | Glacier | ...), and prefetches of the title being typed
+MAX_BATCH = 5
+MAX_PREFETCHES = 1
+FETCH_WORKERS = MAX_BATCH + MAX_PREFETCHES
+# Enough threads to fetch a whole guess at once, even with prefetches running.
+
+# Where each guess led to, and guesses that weren't articles (for a day)
+TITLES_DB = 'titles.db'
+MISSING_TTL = 24 * 3600
+
+# Word counts of every article played are kept here
+STORE_DIR = 'article_vectors'
+
+# High scores, the csv is the old format and is copied in once
+LEADERBOARD_DB = 'leaderboard.db'
+LEADERBOARD_CSV = 'leaderboard.csv'
+
 BASICFONTSIZE = 20
 BASICFONT = pygame.font.Font('freesansbold.ttf', BASICFONTSIZE)
+TEXT_CACHE = TextCache(BASICFONT)
+
+WORD_FILE = 'no_stop_g2.txt'
+ALL_WORDS = None
+# Read the first time a board is made, see all_words().
+
+
+def all_words():
+    """Get the list of words that can be on a board, reading it if needed."""
+    global ALL_WORDS
+    if ALL_WORDS is None:
+        ALL_WORDS = get_word_list(WORD_FILE)
+    return ALL_WORDS
+
 
-ALL_WORDS = get_word_list('no_stop_g2.txt')
+def post_fetched():
+    """Wake up the game loop when an article has been fetched (from any thread)."""
+    try:
+        pygame.event.post(pygame.event.Event(FETCHED))
+    except pygame.error:
+        pass
+        # The game has already quit.
 
 
 def make_text(text, color, bgcolor, top, left):
     """Create the Surface and Rect objects for some text."""
-    surface = BASICFONT.render(text, True, color, bgcolor)
+    surface = TEXT_CACHE.render(text, color, bgcolor)
     rect = surface.get_rect()
     rect.topleft = (top, left)
     return (surface, rect)
 
 
+def load_logo(path):
+    """Load the logo in the display's pixel format."""
+    img = pygame.image.load(path)
+    if img.get_alpha() is not None:
+        return img.convert_alpha()
+    return img.convert()
+
+
+def render_instructions(path):
+    """Render each line of the instructions."""
+    with open(path) as f:
+        text = f.read().split('\n')
+    return [make_text(line, MESSAGECOLOR, BGCOLOR, 100, 230 + 20 * i)
+            for i, line in enumerate(text)]
+
+
+def render_leaderboard(scores):
+    """Render the (score, name) pairs of the top scores."""
+    rendered = []
+    for i, (score, name) in enumerate(scores):
+        msg = '{: >5.0f}'.format(score)
+        rendered.append(make_text(msg, MESSAGECOLOR, BGCOLOR, 1500, 250 + 20 * i))
+        msg = '{}'.format(name[:3].upper())
+        rendered.append(make_text(msg, MESSAGECOLOR, BGCOLOR, 1600, 250 + 20 * i))
+    return rendered
+
+
 class Button(object):
     """A button object."""
 
@@ -64,7 +167,7 @@ class Button(object):
 class Game(object):
     """The game instance."""
 
-    def __init__(self):
+    def __init__(self, record=None, metrics=None):
         # Create the clock
         self.clock = pygame.time.Clock()
 
@@ -72,9 +175,47 @@ class Game(object):
         self.window = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
         pygame.display.set_caption('Wikipedia Bingo')
 
+        # Files drawn on the start screen, loaded once and kept until they change
+        self.assets = AssetManager()
+        self.assets.register('logo', 'WIKIPEDIA_BINGO_small.png', load_logo)
+        self.assets.register('instructions', 'instructions.txt', render_instructions)
+        self.leaderboard = Leaderboard(LEADERBOARD_DB, csv_path=LEADERBOARD_CSV)
+        self.assets.register('leaderboard', LEADERBOARD_DB,
+                             lambda path: render_leaderboard(self.leaderboard.top(25)))
+
         # Default game options (changed on start screen)
         self.limit = 5
         self.board_size = 5
+        self.wiki = 0
+        self.source = 'html'
+
+        # Background article downloads
+        self.fetcher = ArticleFetcher(max_workers=FETCH_WORKERS, notify=post_fetched)
+        self.prefetcher = Prefetcher(self.fetcher, max_running=MAX_PREFETCHES)
+        # Starts fetching the title being typed once typing pauses.
+        self.client = HTTPClient(max_idle=FETCH_WORKERS)
+        # Keeps a connection open for every fetch thread.
+        self.cache = ArticleCache(CACHE_DIR, max_bytes=CACHE_BYTES, ttl=CACHE_TTL)
+        self.store = None
+        # Made with the word list when the first game starts.
+        self.titles = TitleIndex(TITLES_DB, missing_ttl=MISSING_TTL)
+        self.dump = None
+        if os.path.exists(DUMP_FILE + '.idx'):
+            self.dump = WikiDump(DUMP_FILE)
+
+        # Record the games to replay later, every article has to go through the cache
+        self.recorder = None
+        if record is not None:
+            self.recorder = SessionRecorder(record)
+            self.cache = RecordingCache(self.cache, self.recorder)
+            self.dump = None
+            self.titles = None
+            # Replays look articles up by the title that was guessed.
+
+        # Time each guess, to log and/or show with \debug
+        self.metrics_log = MetricsLog(metrics) if metrics is not None else None
+        self.debug = False
+        self.last_span = None
 
     def run(self):
         """Run the game until it quits."""
@@ -100,12 +241,12 @@ class Game(object):
         # Options
         self.buttons['start'] = Button('START',
                                        TEXTCOLOR, TILECOLOR,
-                                       WINDOWWIDTH / 2 - 125, WINDOWHEIGHT - 100)
+                                       WINDOWWIDTH / 2 - 125, WINDOWHEIGHT - 40)
         self.buttons['start'].action = self.next_stage
 
         self.buttons['quit'] = Button('QUIT',
                                       TEXTCOLOR, TILECOLOR,
-                                      WINDOWWIDTH / 2 + 25, WINDOWHEIGHT - 100)
+                                      WINDOWWIDTH / 2 + 25, WINDOWHEIGHT - 40)
         self.buttons['quit'].action = self.terminate
 
         # Difficulty
@@ -164,9 +305,55 @@ class Game(object):
                                          WINDOWWIDTH / 2 + 100, 600)
         self.buttons['7x7_sel'].action = self.set_board_size_to_7x7
 
+        # Article source
+        self.buttons['english'] = Button('English',
+                                         TEXTCOLOR, TILECOLOR,
+                                         WINDOWWIDTH / 2 - 275, 700)
+        self.buttons['english'].action = self.set_wiki_to_english
+        self.buttons['english_sel'] = Button('English',
+                                             TEXTCOLOR, WHITE,
+                                             WINDOWWIDTH / 2 - 275, 700)
+        self.buttons['english_sel'].action = self.set_wiki_to_english
+
+        self.buttons['simple'] = Button('Simple',
+                                        TEXTCOLOR, TILECOLOR,
+                                        WINDOWWIDTH / 2 - 150, 700)
+        self.buttons['simple'].action = self.set_wiki_to_simple
+        self.buttons['simple_sel'] = Button('Simple',
+                                            TEXTCOLOR, WHITE,
+                                            WINDOWWIDTH / 2 - 150, 700)
+        self.buttons['simple_sel'].action = self.set_wiki_to_simple
+
+        self.buttons['html'] = Button('Page',
+                                      TEXTCOLOR, TILECOLOR,
+                                      WINDOWWIDTH / 2 + 25, 700)
+        self.buttons['html'].action = self.set_source_to_html
+        self.buttons['html_sel'] = Button('Page',
+                                          TEXTCOLOR, WHITE,
+                                          WINDOWWIDTH / 2 + 25, 700)
+        self.buttons['html_sel'].action = self.set_source_to_html
+
+        self.buttons['raw'] = Button('Wikitext',
+                                     TEXTCOLOR, TILECOLOR,
+                                     WINDOWWIDTH / 2 + 125, 700)
+        self.buttons['raw'].action = self.set_source_to_raw
+        self.buttons['raw_sel'] = Button('Wikitext',
+                                         TEXTCOLOR, WHITE,
+                                         WINDOWWIDTH / 2 + 125, 700)
+        self.buttons['raw_sel'].action = self.set_source_to_raw
+
+        redraw = True
         while self.loop_stage:
-            # Get events
-            events = pygame.event.get()
+            # Draw the board, if anything has changed
+            if redraw:
+                self.draw_start_screen()
+
+            # Tick the FPS clock
+            self.clock.tick(FPS)
+
+            # Sleep until something happens
+            events = self.wait_for_events(IDLE_MS)
+            redraw = False
 
             # Check clicks
             for event in events:
@@ -176,15 +363,16 @@ class Game(object):
                         button = self.buttons[button_name]
                         if button.rect.collidepoint(event.pos):
                             button.action()
+                    redraw = True
+                if event.type in (loc.VIDEOEXPOSE, loc.VIDEORESIZE):
+                    redraw = True
 
             # Check for exit
             self.check_for_quit(events)
 
-            # Draw the board
-            self.draw_start_screen()
-
-            # Tick the FPS clock
-            self.clock.tick(FPS)
+            # Draw again if the logo, instructions or leaderboard files have changed
+            if not events and self.assets.refresh():
+                redraw = True
 
     def draw_start_screen(self):
         """Draw the start screen."""
@@ -195,7 +383,7 @@ class Game(object):
         # self.window.blit(surf, rect)
 
         # Draw the logo
-        img = pygame.image.load('WIKIPEDIA_BINGO_small.png')
+        img = self.assets.get('logo')
         rect = img.get_rect()
         rect.center = (WINDOWWIDTH / 2, 200)
         self.window.blit(img, rect)
@@ -204,10 +392,7 @@ class Game(object):
         txt = 'INSTRUCTIONS'
         surf, rect = make_text(txt, MESSAGECOLOR, BGCOLOR, 100, 200)
         self.window.blit(surf, rect)
-        with open('instructions.txt') as f:
-            text = f.read().split('\n')
-        for i, line in enumerate(text):
-            textSurf, textRect = make_text(line, MESSAGECOLOR, BGCOLOR, 100, 230 + 20 * i)
+        for textSurf, textRect in self.assets.get('instructions'):
             self.window.blit(textSurf, textRect)
 
         # Draw the buttons
@@ -221,6 +406,9 @@ class Game(object):
         txt = 'Chose board size:'
         surf, rect = make_text(txt, MESSAGECOLOR, BGCOLOR, 850, 550)
         self.window.blit(surf, rect)
+        txt = 'Chose article source:'
+        surf, rect = make_text(txt, MESSAGECOLOR, BGCOLOR, 835, 650)
+        self.window.blit(surf, rect)
         for button_name in self.buttons:
             button = self.buttons[button_name]
             # Size pressed
@@ -237,6 +425,16 @@ class Game(object):
                 continue
             elif self.limit == 7 and button_name in ['limit3_sel', 'limit5_sel', 'limit7']:
                 continue
+            # Wiki button pressed
+            elif self.wiki == 0 and button_name in ['english', 'simple_sel']:
+                continue
+            elif self.wiki == 1 and button_name in ['english_sel', 'simple']:
+                continue
+            # Source button pressed
+            elif self.source == 'html' and button_name in ['html', 'raw_sel']:
+                continue
+            elif self.source == 'raw' and button_name in ['html_sel', 'raw']:
+                continue
             else:
                 self.window.blit(button.surface, button.rect)
 
@@ -245,15 +443,7 @@ class Game(object):
         surf, rect = make_text(txt, MESSAGECOLOR, BGCOLOR, 1500, 200)
         self.window.blit(surf, rect)
 
-        scoreboard = pd.read_csv('leaderboard.csv')
-        strings = scoreboard['name'].values
-        scores = scoreboard['score'].values
-        for i, (name, score) in enumerate(zip(strings[:25], scores[:25])):
-            msg = '{: >5.0f}'.format(score)
-            textSurf, textRect = make_text(msg, MESSAGECOLOR, BGCOLOR, 1500, 250 + 20 * i)
-            self.window.blit(textSurf, textRect)
-            msg = '{}'.format(name[:3].upper())
-            textSurf, textRect = make_text(msg, MESSAGECOLOR, BGCOLOR, 1600, 250 + 20 * i)
+        for textSurf, textRect in self.assets.get('leaderboard'):
             self.window.blit(textSurf, textRect)
 
         # Update the dipslay
@@ -266,12 +456,16 @@ class Game(object):
         # Default user name
         self.name = None
 
-        # Generate a new puzzle
-        self.get_starting_board()
+        # Word counts of articles played before (not used when recording)
+        if self.store is None and self.recorder is None:
+            self.store = VocabStore(STORE_DIR, all_words())
 
-        # Create list of red tiles
-        self.board_counts = np.zeros((self.board_size, self.board_size))
-        self.board_new = np.zeros((self.board_size, self.board_size))
+        # Generate a new puzzle
+        self.seed = random.getrandbits(32)
+        self.engine = BingoEngine(all_words(), self.board_size, self.limit, seed=self.seed)
+        if self.recorder is not None:
+            self.recorder.start_game(self.seed, self.board_size, self.limit,
+                                     self.wiki, self.source, WORD_FILE)
 
         # Quit button
         self.buttons = {}
@@ -283,18 +477,17 @@ class Game(object):
         # Create TextInput-object
         self.textinput = TextInput(text_color=TEXTCOLOR, cursor_color=TEXTCOLOR)
 
-        # Create the message array (starts blank)
-        self.message_array = None
-
-        # Initial score.
-        self.score = 0
-
         # Draw the initial board
+        self.full_redraw = True
         self.draw_main_screen()
 
         while self.loop_stage:
-            # Get events
-            events = pygame.event.get()
+            # Sleep until something happens, the cursor blinks or typing pauses
+            timeout = min(IDLE_MS, self.textinput.get_wait_ms())
+            prefetch_wait = self.prefetcher.get_wait()
+            if prefetch_wait is not None:
+                timeout = min(timeout, prefetch_wait * 1000)
+            events = self.wait_for_events(timeout)
 
             # Check clicks
             for event in events:
@@ -304,9 +497,30 @@ class Game(object):
                         button = self.buttons[button_name]
                         if button.rect.collidepoint(event.pos):
                             button.action()
-
-            # Send events to the text reader
-            if self.textinput.update(events):
+                if event.type in (loc.VIDEOEXPOSE, loc.VIDEORESIZE):
+                    # The window contents were lost, draw everything again
+                    self.full_redraw = True
+
+            # Apply any articles that have finished downloading, in the order they were guessed
+            results = self.fetcher.poll()
+            for result in results:
+                self.apply_article(result)
+                if self.engine.game_won():
+                    # The rest of the batch isn't needed
+                    self.fetcher.cancel_all()
+                    break
+                if self.fetcher.busy:
+                    self.engine.message_array.append(
+                        'Fetching {} more...'.format(len(self.fetcher.pending)))
+
+            # Send events to the text reader (ignore enter while fetching)
+            entered = self.textinput.update(events) and not self.fetcher.busy
+            if not entered and not self.engine.game_won():
+                # Fetch the title being typed early, the last one of a batch
+                titles = split_titles(self.textinput.get_text())
+                args, options = self.fetch_options()
+                self.prefetcher.update(titles[-1] if titles else '', *args, **options)
+            if entered:
                 # Pressed enter
                 user_input = self.textinput.get_text()
                 self.textinput.clear_text()
@@ -317,188 +531,260 @@ class Game(object):
                     if command in ['q', 'quit']:
                         self.terminate()
                     if command == 'add':
-                        self.board_counts += 1
+                        self.engine.board_counts += 1
+                        if self.recorder is not None:
+                            self.recorder.command(command, self.engine)
+                    if command == 'debug':
+                        self.debug = not self.debug
                 else:
                     # DEBUG
-                    print(self.board_words)
-
-                    # Get the article title
-                    title = user_input.lower()
-
-                    # Put the title in the top left
-                    self.message_array = [title + ':']
-
-                    if not self.game_won():
-                        # Reset the new word counter
-                        self.board_new = np.zeros((self.board_size, self.board_size))
-
-                        # Get the wikipedia article
-                        validation = Validation(title)
-                        try:
-                            validation.scrape_wiki()
-                            validation.process_wiki()
-                            words = validation.token
-                            self.score += 1
-                            print(self.score)
-                        except Exception:
-                            self.message_array.append('Article not found')
-                            words = []
-                            self.score += 1
-                            print(self.score)
-
-                        # Remove any words not on the board
-                        words = [word.lower()
-                                 for word in words
-                                 if word.lower() in self.board_words.flatten()]
-
-                        # Count the frequencies
-                        counter = Counter(words)
-
-                        # Create the message for the top left
-                        if len(words) == 0:
-                            self.message_array.append('No valid words')
-
-                        for word in sorted(counter, key=lambda x: counter[x], reverse=True):
-                            x, y = tuple(np.argwhere(self.board_words == word.lower())[0])
-                            current_count = self.board_counts[x][y]
-                            limit = self.board_limits[x][y]
-                            new_count = current_count + counter[word]
-
-                            # Create the message array for the left hand courner
-                            message = '{} ({:.0f})+{:.0f} = {:.0f}/{:.0f}'.format(word,
-                                                                                  current_count,
-                                                                                  counter[word],
-                                                                                  new_count,
-                                                                                  limit)
-                            self.message_array.append(message)
-
-                            # Check if the counter has overflowed
-                            new_word = None
-                            new_range = None
-                            if new_count >= limit:
-                                new_count = 0
-                                new_word, new_range = self.get_new_word()
-                                self.message_array.append('  OVERFLOW > {}'.format(new_word))
-
-                            # Save the new count, new word (if needed) and message
-                            self.board_counts[x][y] = new_count
-                            if new_word:
-                                print(new_word)
-                                self.board_words[x][y] = new_word
-                                self.board_limits[x][y] = new_range
-                                self.board_new[x][y] = 1
+                    print(self.engine.board_words)
+
+                    # Get the article titles, several can be guessed at once with |
+                    titles = split_titles(user_input, MAX_BATCH) or [user_input.lower()]
+
+                    # Put the titles in the top left, each article's messages go under them
+                    self.engine.start_batch(titles)
+
+                    if not self.engine.game_won():
+                        # Fetch the articles in the background, unless they already are
+                        args, options = self.fetch_options()
+                        for title in titles:
+                            prefetch = self.prefetcher.take(title)
+                            if prefetch is not None:
+                                self.fetcher.adopt(title, *prefetch)
+                                continue
+                            span = None
+                            if self.metrics_log is not None or self.debug:
+                                span = Span(title)
+                            self.fetcher.submit(title, *args, span=span, **options)
+                        if len(titles) == 1:
+                            self.engine.message_array.append('Fetching article...')
+                        else:
+                            self.engine.message_array.append(
+                                'Fetching {} articles...'.format(len(titles)))
                     else:
                         # You win!
-                        self.scoring_algorithm()
+                        self.engine.scoring_algorithm()
 
                         if not self.name and len(user_input) > 0:
                             self.name = user_input
 
                             # Update the leaderboard.
-                            new_win = pd.DataFrame(columns=['score', 'name'])
-
-                            new_win.loc[0] = [self.final_score, self.name]
-                            leaderboard = pd.read_csv('leaderboard.csv')
-                            new_leaderboard = pd.concat([leaderboard, new_win])
-                            new_leaderboard = new_leaderboard.sort_values('score', ascending=False)
-                            new_leaderboard.to_csv('leaderboard.csv', index=False)
+                            self.leaderboard.add(self.engine.final_score, self.name)
+                            self.assets.invalidate('leaderboard')
 
                             return
 
             # Check for exit
             self.check_for_quit(events)
 
-            # Draw the board
-            self.draw_main_screen()
+            # Draw the board, if anything has changed
+            if self.full_redraw or results or entered or self.textinput.changed:
+                self.draw_main_screen()
 
             # Tick the FPS clock
             self.clock.tick(FPS)
 
+    def wait_for_events(self, timeout):
+        """Sleep until there's an event or timeout ms have passed, returning every event"""
+        timeout = max(1, int(timeout))
+        if pygame.display.get_driver() not in POLLING_DRIVERS:
+            event = pygame.event.wait(timeout)
+            if event.type == loc.NOEVENT:
+                return []
+            return [event] + pygame.event.get()
+
+        # SDL would check for events every millisecond, check less often instead
+        end = pygame.time.get_ticks() + timeout
+        events = pygame.event.get()
+        while not events and pygame.time.get_ticks() < end:
+            pygame.time.wait(min(POLL_MS, end - pygame.time.get_ticks()))
+            events = pygame.event.get()
+        return events
+
+    def fetch_options(self):
+        """The arguments every article fetch is made with"""
+        return (self.wiki,), dict(cache=self.cache, client=self.client, tokenizer='fast',
+                                  stream=True, source=self.source, dump=self.dump,
+                                  store=self.store, titles=self.titles)
+
     def draw_main_screen(self):
-        """Draw the main screen."""
-        self.window.fill(BGCOLOR)
+        """Draw the main screen, only redrawing the parts that have changed."""
+        won = self.engine.game_won()
+        if won:
+            self.engine.scoring_algorithm()
+        regions = self.main_screen_regions(won)
+
+        if self.full_redraw:
+            self.window.fill(BGCOLOR)
+            self.drawn_tiles = {}
+            self.drawn_regions = {}
+
+        # Clear any text that has changed
+        dirty = []
+        for name, (key, _) in regions:
+            drawn = self.drawn_regions.get(name)
+            if drawn is not None and drawn[0] != key:
+                self.window.fill(BGCOLOR, drawn[1])
+                dirty.append(drawn[1])
+        cleared = list(dirty)
+
         # Draw the board
-        for tilex in range(len(self.board_words)):
-            for tiley in range(len(self.board_words[0])):
-                word = self.board_words[tilex][tiley]
+        tiles = []
+        for tilex in range(len(self.engine.board_words)):
+            for tiley in range(len(self.engine.board_words[0])):
+                word = self.engine.board_words[tilex][tiley]
 
                 # Change the BG colour based on the count
-                count = self.board_counts[tilex][tiley]
-                limit = self.board_limits[tilex][tiley]
+                count = self.engine.board_counts[tilex][tiley]
+                limit = self.engine.board_limits[tilex][tiley]
                 if 0 < count < limit:
                     bgcolour = (255, 255 - count * 255 / limit, 255 - count * 255 / limit)
                 else:
                     bgcolour = GREEN
 
                 # Change the text colour if it's new
-                new = self.board_new[tilex][tiley]
+                new = self.engine.board_new[tilex][tiley]
                 if new:
                     bgcolour = (60, 185, 100)
 
-                # Draw the tile
-                self.draw_tile(tilex, tiley, word, count, limit, TEXTCOLOR, bgcolour)
+                # Only draw tiles that have changed or been drawn over
+                state = (word, count, limit, bgcolour)
+                drawn = self.drawn_tiles.get((tilex, tiley))
+                if drawn is None or drawn[0] != state or drawn[1].collidelist(dirty) != -1:
+                    rect = self.draw_tile(tilex, tiley, word, count, limit, TEXTCOLOR, bgcolour)
+                    self.drawn_tiles[(tilex, tiley)] = (state, rect)
+                    tiles.append(rect)
 
         left, top = self.get_tile_courner(0, 0)
         width = self.board_size * TILE_WIDTH
         height = self.board_size * TILE_HEIGHT
-        pygame.draw.rect(self.window, BORDERCOLOR, (left - 5, top - 5, width + 11, height + 11), 4)
+        border = pygame.draw.rect(self.window, BORDERCOLOR,
+                                  (left - 5, top - 5, width + 11, height + 11), 4)
+        if border.collidelist(dirty) != -1:
+            dirty.append(border)
+        dirty += tiles
+
+        # Draw the text that has changed, been drawn over or cleared with other text
+        damaged = tiles + cleared
+        for name, (key, draw) in regions:
+            drawn = self.drawn_regions.get(name)
+            if drawn is None or drawn[0] != key or drawn[1].collidelist(damaged) != -1:
+                rect = draw()
+                self.drawn_regions[name] = (key, rect)
+                dirty.append(rect)
 
-        # Draw the count
-        msg = 'COUNT: {:.0f}'.format(self.score)
-        surf, rect = make_text(msg, MESSAGECOLOR, BGCOLOR, 5, 5)
-        self.window.blit(surf, rect)
-
-        # Draw the message
-        if self.message_array:
-            for i, msg in enumerate(self.message_array):
-                textSurf, textRect = make_text(msg, MESSAGECOLOR, BGCOLOR, 5, 35 + 20 * i)
+        # Update the dipslay
+        if self.full_redraw:
+            pygame.display.update()
+            self.full_redraw = False
+        else:
+            pygame.display.update(dirty)
+
+    def main_screen_regions(self, won):
+        """Get the (name, (contents, draw function)) of each part of the main screen."""
+        def draw_text(lines):
+            # Draw (text, colour, x, y) lines and return the area covered
+            rect = pygame.Rect(lines[0][2], lines[0][3], 0, 0) if lines else pygame.Rect(0, 0, 0, 0)
+            for text, color, x, y in lines:
+                textSurf, textRect = make_text(text, color, BGCOLOR, x, y)
                 self.window.blit(textSurf, textRect)
-
-        # Draw the winning message if you've won
-        if self.game_won():
-            # Display winning message
-            textSurf, textRect = make_text('!! WINNER !!',
-                                           MESSAGECOLOR, BGCOLOR,
-                                           WINDOWWIDTH / 2 - 75, 5)
-            self.window.blit(textSurf, textRect)
-
-            # Display score
-            self.scoring_algorithm()
-            textSurf, textRect = make_text('FINAL SCORE: {:.0f}'.format(self.final_score),
-                                           MESSAGECOLOR, BGCOLOR,
-                                           WINDOWWIDTH / 2 - 120, 25)
-            self.window.blit(textSurf, textRect)
-
-        # Draw the instructions
-        if not self.game_won():
-            instruct = 'Enter the name of a Wikipedia article:'
-            color = MESSAGECOLOR
+                rect = rect.union(textRect)
+            return rect
+
+        # The count and the message
+        lines = [('COUNT: {:.0f}'.format(self.engine.score), MESSAGECOLOR, 5, 5)]
+        if self.engine.message_array:
+            for i, msg in enumerate(self.engine.message_array):
+                lines.append((msg, MESSAGECOLOR, 5, 35 + 20 * i))
+        messages = lines
+
+        # The winning message if you've won
+        winner = []
+        if won:
+            winner = [('!! WINNER !!', MESSAGECOLOR, WINDOWWIDTH / 2 - 75, 5),
+                      ('FINAL SCORE: {:.0f}'.format(self.engine.final_score),
+                       MESSAGECOLOR, WINDOWWIDTH / 2 - 120, 25)]
+
+        # Show that an article is still downloading
+        fetching = []
+        if self.fetcher.busy:
+            dots = '.' * (1 + pygame.time.get_ticks() // 300 % 3)
+            left, top = self.get_tile_courner(0, 0)
+            fetching = [('FETCHING ARTICLE' + dots, MESSAGECOLOR, left, top - 35)]
+
+        # The instructions
+        if not won:
+            instruct = [('Enter the name of a Wikipedia article:', MESSAGECOLOR, 5, WINDOWHEIGHT - 60)]
         else:
-            instruct = 'Enter your name to add to the leaderboard (MAX 3 LETTERS):'
-            color = (255, 50, 50)
-        instructSurf, instructRect = make_text(instruct,
-                                               color, BGCOLOR,
-                                               5, WINDOWHEIGHT - 60)
-        self.window.blit(instructSurf, instructRect)
-
-        # Draw the text box
-        self.window.blit(self.textinput.get_surface(), (5, WINDOWHEIGHT - 30))
-
-        # Draw the buttons
-        for button_name in self.buttons:
-            button = self.buttons[button_name]
-            self.window.blit(button.surface, button.rect)
-
-        # Update the dipslay
-        pygame.display.update()
+            instruct = [('Enter your name to add to the leaderboard (MAX 3 LETTERS):',
+                         (255, 50, 50), 5, WINDOWHEIGHT - 60)]
+
+        def draw_textinput():
+            surface = self.textinput.get_surface()
+            return self.window.blit(surface, (5, WINDOWHEIGHT - 30))
+
+        def draw_buttons():
+            rect = pygame.Rect(0, 0, 0, 0)
+            for button_name in self.buttons:
+                button = self.buttons[button_name]
+                rect = rect.union(self.window.blit(button.surface, button.rect))
+            return rect
+
+        # The timings of the last guess
+        debug = []
+        if self.debug and self.last_span is not None:
+            span = self.last_span
+            debug.append(('{} {:.1f} ms'.format(span.title, span.total * 1000),
+                          MESSAGECOLOR, WINDOWWIDTH - 320, 120))
+            for stage, seconds in span.ordered_stages():
+                debug.append(('  {} {:.1f} ms'.format(stage, seconds * 1000),
+                              MESSAGECOLOR, WINDOWWIDTH - 320, 120 + 20 * len(debug)))
+            for name, number in span.counts.items():
+                debug.append(('  {} {}'.format(name, number),
+                              MESSAGECOLOR, WINDOWWIDTH - 320, 120 + 20 * len(debug)))
+
+        return [('messages', (tuple(messages), lambda: draw_text(messages))),
+                ('winner', (tuple(winner), lambda: draw_text(winner))),
+                ('fetching', (tuple(fetching), lambda: draw_text(fetching))),
+                ('instructions', (tuple(instruct), lambda: draw_text(instruct))),
+                ('textinput', (self.textinput.get_surface(), draw_textinput)),
+                ('buttons', (tuple(self.buttons), draw_buttons)),
+                ('debug', (tuple(debug), lambda: draw_text(debug)))]
+
+    def apply_article(self, result):
+        """Count the words of a fetched article against the board."""
+        counter = result.count_words(self.engine.board_index)
+        start = time.perf_counter()
+        new_words = self.engine.apply_counts(result.title, counter, result.found)
+        if result.span is not None:
+            result.span.add('apply', time.perf_counter() - start)
+            result.span.finish(result.error)
+            self.last_span = result.span
+            if self.metrics_log is not None:
+                self.metrics_log.write(result.span)
+        if self.recorder is not None:
+            self.recorder.turn(result.title, self.engine)
+        print(self.engine.score)
+        for new_word in new_words:
+            print(new_word)
 
     # # # # #  BUTTON FUNCTIONS
     def next_stage(self):
         """Go to the next stage."""
+        # Forget about any articles still downloading
+        self.fetcher.cancel_all()
+        self.prefetcher.cancel_all()
         self.loop_stage = False
 
     def terminate(self):
         """Quit the game."""
+        self.fetcher.shutdown()
+        self.client.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        print('Article cache: {hits} hits, {misses} misses'.format(**self.cache.stats()))
         pygame.quit()
         sys.exit()
 
@@ -526,6 +812,22 @@ class Game(object):
         """Set the tile limits."""
         self.limit = 7
 
+    def set_wiki_to_english(self):
+        """Set the wiki articles come from."""
+        self.wiki = 0
+
+    def set_wiki_to_simple(self):
+        """Set the wiki articles come from."""
+        self.wiki = 1
+
+    def set_source_to_html(self):
+        """Set the article source."""
+        self.source = 'html'
+
+    def set_source_to_raw(self):
+        """Set the article source."""
+        self.source = 'raw'
+
     def check_for_quit(self, events):
         """Check for quit events."""
         for event in events:
@@ -536,34 +838,6 @@ class Game(object):
                 # terminate if the KEYUP event was for the Esc key
                 self.terminate()
 
-    def get_starting_board(self):
-        """Return a board data structure with tiles in the solved state."""
-        words = []
-        ranges = []
-        for _ in range(self.board_size * self.board_size):
-            word, limit = self.get_new_word()
-            words.append(word)
-            ranges.append(limit)
-        self.board_words = np.array(words, dtype=object).reshape((self.board_size, self.board_size))
-        self.board_limits = np.array(ranges).reshape((self.board_size, self.board_size))
-
-    def get_new_word(self):
-        """Get an unused word from the list of all words."""
-        while True:
-            target = TargetWord(ALL_WORDS)
-            target.word_gen()
-            word = target.word.lower()
-            target.range_gen()
-            limit = self.limit
-
-            try:
-                if word not in self.board_words.flatten():
-                    break
-            except Exception:
-                break
-
-        return word, limit
-
     def get_tile_courner(self, tilex, tiley):
         """Get the coordinates of the top left courner of a tile."""
         xmargin = int((WINDOWWIDTH - (TILE_WIDTH * self.board_size + (self.board_size - 1))) / 2)
@@ -575,75 +849,36 @@ class Game(object):
     def draw_tile(self, tilex, tiley, word, count, limit, txtcolour=TEXTCOLOR, bgcolour=TILECOLOR):
         """Draw a tile at board coordinates tilex and tiley."""
         left, top = self.get_tile_courner(tilex, tiley)
-        pygame.draw.rect(self.window, bgcolour, (left, top, TILE_WIDTH, TILE_HEIGHT))
+        tile = pygame.draw.rect(self.window, bgcolour, (left, top, TILE_WIDTH, TILE_HEIGHT))
 
-        surf = BASICFONT.render(str(word), True, txtcolour)
+        surf = TEXT_CACHE.render(str(word), txtcolour)
         rect = surf.get_rect()
         rect.center = (left + int(TILE_WIDTH / 2), top + int(TILE_HEIGHT / 2))
         self.window.blit(surf, rect)
 
         txt = '{:.0f}/{:.0f}'.format(count, limit)
         # txt = '{}{}'.format('-' * int(count), '*' * int(limit - count))
-        surf = BASICFONT.render(txt, True, txtcolour)
+        surf = TEXT_CACHE.render(txt, txtcolour)
         rect = surf.get_rect()
         rect.center = (left + int(TILE_WIDTH / 2) + 75, top + int(TILE_HEIGHT / 2) + 20)
         self.window.blit(surf, rect)
-
-    def game_won(self):
-        """Determine if anyone has won the game."""
-        won = False
-
-        # check for winning rows
-        for row in self.board_counts:
-            if all(row > 0):
-                won = True
-
-        # check for winning columns
-        for col in self.board_counts.T:
-            if all(col > 0):
-                won = True
-
-        return won
-
-    def scoring_algorithm(self):
-        """
-        Scores a player's performance
-
-        Parameters
-        ---------
-        N : int
-            number of wiki articles used to win
-        mode : int
-            Either 3, 5 or 7 for Easy, Medium and Hard
-        grid : int
-            Either 3, 5 or 7 for size of grid 3by3, 5by5 and 7by7
-        """
-
-        self.final_score = 0
-        if self.board_size == 3:
-            self.final_score += 2000
-        elif self.board_size == 5:
-            self.final_score += 4000
-        elif self.board_size == 7:
-            self.final_score += 6000
-
-        if self.limit == 3:
-            self.final_score += 4000
-        elif self.limit == 5:
-            self.final_score += 6000
-        elif self.limit == 7:
-            self.final_score += 8000
-
-        self.final_score = int(self.final_score / (self.score + 1))
+        return tile.union(rect)
 
 
 def main():
     """Run the main process."""
+    parser = argparse.ArgumentParser(description='Wikipedia Bingo')
+    parser.add_argument('--record', metavar='FILE',
+                        help='record the games played to FILE, replay with session.py')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='log how long each stage of every guess took to FILE (JSON lines)')
+    args = parser.parse_args()
+
     # Initilise PyGame
     pygame.init()
 
     # Create a game instance
-    game = Game()
+    game = Game(record=args.record, metrics=args.metrics)
 
     # Run the game
     game.run()
@@ -0,0 +1,112 @@
+"""Extract and tokenise page text while the html is still arriving."""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+from tokenizer import word_tokenize
+
+
+REFERENCE = re.compile(r'\[(\d+)\]')
+
+HIDDEN_TAGS = {'script', 'style', 'template'}
+# BeautifulSoup doesn't count the contents of these as text.
+
+
+class StreamingExtractor(HTMLParser):
+    """
+    Turn html into tokens chunk by chunk without building a document tree.
+
+    Text is buffered only until the next whitespace, where it's cleaned of
+    [edit] and [n] references and handed to the tokenizer. No token or
+    reference contains whitespace, so this gives the same tokens as running
+    the tokenizer over the whole text at once.
+    """
+
+    def __init__(self, tokenize=word_tokenize, batch_chars=64 * 1024):
+        """Initialise the parameters"""
+        super().__init__(convert_charrefs=True)
+        self.tokenize = tokenize
+        self.batch_chars = batch_chars
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.hidden = 0
+        self.pending = []
+        self.pending_chars = 0
+        self.carry = ''
+        self.token = []
+        self.bytes_in = 0
+        self.canonical = None
+        # The address in <link rel="canonical">, i.e. the article's real title.
+
+    def feed_bytes(self, data):
+        """Parse the next piece of the page"""
+        self.bytes_in += len(data)
+        self.feed(self.decoder.decode(data))
+
+    def close(self):
+        """Finish parsing and tokenise any remaining text"""
+        self.feed(self.decoder.decode(b'', final=True))
+        super().close()
+        self.flush(final=True)
+        return self.token
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HIDDEN_TAGS:
+            self.hidden += 1
+        elif tag == 'link' and self.canonical is None:
+            attrs = dict(attrs)
+            if attrs.get('rel') == 'canonical':
+                self.canonical = attrs.get('href')
+
+    def handle_endtag(self, tag):
+        if tag in HIDDEN_TAGS and self.hidden:
+            self.hidden -= 1
+
+    def handle_data(self, data):
+        if self.hidden:
+            return
+        self.pending.append(data)
+        self.pending_chars += len(data)
+        if self.pending_chars >= self.batch_chars:
+            self.flush()
+
+    def flush(self, final=False):
+        """Clean and tokenise the text up to the last whitespace"""
+        text = self.carry + ''.join(self.pending)
+        self.pending = []
+        self.pending_chars = 0
+
+        if final:
+            cut = len(text)
+        else:
+            cut = max(text.rfind(' '), text.rfind('\n'), text.rfind('\t'),
+                      text.rfind('\r'), text.rfind('\xa0')) + 1
+            if cut == 0 and len(text) > 16 * self.batch_chars:
+                cut = len(text)
+                # No whitespace for a very long way, give up waiting.
+
+        self.carry = text[cut:]
+        text = text[:cut]
+        if not text:
+            return
+
+        text = text.replace('[edit]', '')
+        # Get rid of random [edit].
+        text = REFERENCE.sub('', text)
+        # Get rid of reference numbers.
+
+        self.token.extend(self.tokenize(text))
+
+
+def stream_tokens(chunks, tokenize=word_tokenize):
+    """Tokenise a page given as an iterable of byte strings"""
+    extractor = StreamingExtractor(tokenize)
+    for chunk in chunks:
+        extractor.feed_bytes(chunk)
+    return extractor.close()
+
+
+def iter_chunks(data, size=64 * 1024):
+    """Split bytes that are already in memory into chunks"""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
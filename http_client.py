@@ -0,0 +1,251 @@
+"""A small pooled keep-alive HTTP client for fetching Wikipedia pages."""
+
+import http.client
+import threading
+import time
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+REDIRECTS = (301, 302, 303, 307, 308)
+
+
+class HTTPError(IOError):
+    """A page couldn't be fetched."""
+
+    def __init__(self, url, status):
+        super().__init__('HTTP {} for {}'.format(status, url))
+        self.url = url
+        self.status = status
+
+
+class IdentityDecoder:
+    """Pass data through unchanged."""
+
+    def decompress(self, data):
+        return data
+
+    def flush(self):
+        return b''
+
+
+class BrotliDecoder:
+    """Wrap a brotli decompressor in the zlib interface."""
+
+    def __init__(self):
+        self.decompressor = brotli.Decompressor()
+
+    def decompress(self, data):
+        return self.decompressor.process(data)
+
+    def flush(self):
+        return b''
+
+
+def accept_encoding():
+    """Get the Accept-Encoding header for the available decoders"""
+    if brotli is not None:
+        return 'br, gzip, deflate'
+    return 'gzip, deflate'
+
+
+def make_decoder(encoding):
+    """Get a streaming decoder for a Content-Encoding"""
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return zlib.decompressobj()
+    if encoding == 'br' and brotli is not None:
+        return BrotliDecoder()
+    if encoding == 'identity':
+        return IdentityDecoder()
+    raise HTTPError(encoding, 'unsupported encoding')
+
+
+class HTTPClient:
+    """
+    Fetch pages over reused HTTP/1.1 connections with compressed transfer.
+
+    Idle connections are kept per (scheme, host, port), so consecutive
+    guesses against en.wikipedia.org skip the TCP and TLS handshakes. The
+    client is safe to share between threads.
+    """
+
+    def __init__(self, max_idle=4, timeout=10, chunk_size=64 * 1024,
+                 user_agent='wikipedia-bingo'):
+        """Initialise the parameters"""
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.user_agent = user_agent
+        self.idle = {}
+        self.lock = threading.Lock()
+
+        # Counters
+        self.requests = 0
+        self.connections = 0
+        self.bytes_on_wire = 0
+        self.bytes_decoded = 0
+
+    def connect(self, key):
+        """Open a new connection to a host"""
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        with self.lock:
+            self.connections += 1
+        return conn
+
+    def acquire(self, key):
+        """Get an idle connection to a host, or None"""
+        with self.lock:
+            pool = self.idle.get(key)
+            if pool:
+                return pool.pop()
+        return None
+
+    def release(self, key, conn, response):
+        """Return a finished connection to the pool"""
+        if response.will_close:
+            conn.close()
+            return
+        with self.lock:
+            pool = self.idle.setdefault(key, [])
+            if len(pool) < self.max_idle:
+                pool.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close every idle connection"""
+        with self.lock:
+            pools = list(self.idle.values())
+            self.idle = {}
+        for pool in pools:
+            for conn in pool:
+                conn.close()
+
+    def request(self, url, span=None):
+        """Send a GET request, reusing a connection where possible"""
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = {'Accept-Encoding': accept_encoding(),
+                   'User-Agent': self.user_agent}
+
+        conn = self.acquire(key)
+        if conn is not None:
+            try:
+                start = time.perf_counter()
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                if span is not None:
+                    span.add('request', time.perf_counter() - start)
+                return key, conn, response
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                # The server dropped an idle connection, try a new one.
+
+        conn = self.connect(key)
+        try:
+            if span is not None:
+                start = time.perf_counter()
+                conn.connect()
+                span.add('connect', time.perf_counter() - start)
+                # DNS, TCP and TLS, timed apart from the request itself.
+            start = time.perf_counter()
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            if span is not None:
+                span.add('request', time.perf_counter() - start)
+            return key, conn, response
+        except Exception:
+            conn.close()
+            raise
+
+    def stream(self, url, max_redirects=5, span=None):
+        """Yield the decoded body of a page chunk by chunk"""
+        for _ in range(max_redirects + 1):
+            key, conn, response = self.request(url, span)
+            with self.lock:
+                self.requests += 1
+
+            if response.status in REDIRECTS:
+                location = response.getheader('Location')
+                response.read()
+                self.release(key, conn, response)
+                if not location:
+                    raise HTTPError(url, response.status)
+                url = urljoin(url, location)
+                continue
+
+            if response.status != 200:
+                response.read()
+                self.release(key, conn, response)
+                raise HTTPError(url, response.status)
+
+            yield from self.read_body(key, conn, response, span)
+            return
+
+        raise HTTPError(url, 'too many redirects')
+
+    def read_body(self, key, conn, response, span=None):
+        """Decode a response body as it arrives"""
+        finished = False
+        try:
+            decoder = make_decoder(response.getheader('Content-Encoding'))
+            while True:
+                if span is None:
+                    chunk = response.read(self.chunk_size)
+                    data = decoder.decompress(chunk)
+                else:
+                    start = time.perf_counter()
+                    chunk = response.read(self.chunk_size)
+                    read = time.perf_counter()
+                    data = decoder.decompress(chunk)
+                    span.add('download', read - start)
+                    span.add('decode', time.perf_counter() - read)
+                    span.count('bytes_on_wire', len(chunk))
+                    span.count('bytes_decoded', len(data))
+                if not chunk:
+                    break
+                with self.lock:
+                    self.bytes_on_wire += len(chunk)
+                    self.bytes_decoded += len(data)
+                if data:
+                    yield data
+            data = decoder.flush()
+            with self.lock:
+                self.bytes_decoded += len(data)
+            if data:
+                yield data
+            finished = True
+        finally:
+            if finished:
+                self.release(key, conn, response)
+            else:
+                conn.close()
+                # Abandoned half way, the connection can't be reused.
+
+    def get(self, url, span=None):
+        """Download a whole page"""
+        return b''.join(self.stream(url, span=span))
+
+    def stats(self):
+        """Return the client counters"""
+        with self.lock:
+            return {'requests': self.requests,
+                    'connections': self.connections,
+                    'bytes_on_wire': self.bytes_on_wire,
+                    'bytes_decoded': self.bytes_decoded}
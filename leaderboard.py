@@ -0,0 +1,95 @@
+"""Keep the high scores in an SQLite database."""
+
+import csv
+import os
+import sqlite3
+import time
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score REAL NOT NULL,
+    name TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+
+class Leaderboard:
+    """
+    High scores stored in SQLite with an index on the score.
+
+    Adding a score is a single indexed insert and the top scores are read
+    straight off the index, so neither gets slower as the table grows.
+    Every write is its own transaction and SQLite locks the file, so
+    several games can share one leaderboard.
+
+    Scores from an old leaderboard.csv are copied in the first time the
+    database is opened.
+    """
+
+    def __init__(self, path='leaderboard.db', csv_path=None, timeout=10):
+        """Initialise the parameters"""
+        self.path = path
+        self.timeout = timeout
+        db = self.connect()
+        try:
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+        if csv_path is not None:
+            self.import_csv(csv_path)
+
+    def connect(self):
+        """Open a connection to the database"""
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    def import_csv(self, csv_path):
+        """Copy the scores from a csv file, only ever once per database"""
+        db = self.connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            # Lock out other games so the scores can't be copied twice.
+            done = db.execute("SELECT value FROM meta WHERE key = 'imported_csv'").fetchone()
+            if done is None and os.path.exists(csv_path):
+                with open(csv_path, newline='') as f:
+                    rows = [(float(row['score']), row['name'], time.time())
+                            for row in csv.DictReader(f)]
+                db.executemany('INSERT INTO scores (score, name, created) VALUES (?, ?, ?)', rows)
+            if done is None:
+                db.execute("INSERT INTO meta VALUES ('imported_csv', ?)", (csv_path,))
+            db.commit()
+        finally:
+            db.close()
+
+    def add(self, score, name):
+        """Add a score to the leaderboard"""
+        db = self.connect()
+        try:
+            with db:
+                db.execute('INSERT INTO scores (score, name, created) VALUES (?, ?, ?)',
+                           (float(score), name, time.time()))
+        finally:
+            db.close()
+
+    def top(self, n=25):
+        """Return the n highest (score, name) pairs"""
+        db = self.connect()
+        try:
+            return db.execute('SELECT score, name FROM scores ORDER BY score DESC, id LIMIT ?',
+                              (n,)).fetchall()
+        finally:
+            db.close()
+
+    def __len__(self):
+        db = self.connect()
+        try:
+            return db.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+        finally:
+            db.close()
@@ -0,0 +1,106 @@
+"""Time the stages of each guess and log them."""
+
+import json
+import os
+import threading
+import time
+
+
+STAGES = ['store', 'dump', 'cache', 'connect', 'request', 'download', 'decode',
+          'parse', 'clean', 'tokenize', 'match', 'apply']
+# In the order they happen, for showing spans.
+
+
+class Span:
+    """
+    Timings and counts for every stage of one guess.
+
+    Made by the game when metrics are on and passed down to Validation and
+    HTTPClient, which only time anything when they're given one, so there's
+    no cost when metrics are off. Times are seconds from a monotonic clock.
+    Stages that happen more than once, e.g. download, are added up.
+    """
+
+    def __init__(self, title):
+        """Initialise the parameters"""
+        self.title = title
+        self.time = time.time()
+        self.start = time.perf_counter()
+        self.end = None
+        self.stages = {}
+        self.counts = {}
+        self.error = None
+
+    def add(self, stage, seconds):
+        """Add time spent in a stage"""
+        self.stages[stage] = self.stages.get(stage, 0) + seconds
+
+    def count(self, name, number):
+        """Add to a count, e.g. bytes or tokens"""
+        self.counts[name] = self.counts.get(name, 0) + number
+
+    def finish(self, error=None):
+        """Mark the guess as done"""
+        self.end = time.perf_counter()
+        if error is not None:
+            self.error = repr(error)
+
+    @property
+    def total(self):
+        """Seconds from the guess being made to it finishing"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+    def as_dict(self):
+        """The span as a JSON-friendly dictionary, times in milliseconds"""
+        record = {'time': round(self.time, 3), 'title': self.title,
+                  'total_ms': round(self.total * 1000, 3),
+                  'stages_ms': {stage: round(seconds * 1000, 3)
+                                for stage, seconds in self.ordered_stages()},
+                  'counts': self.counts}
+        if self.error is not None:
+            record['error'] = self.error
+        return record
+
+    def ordered_stages(self):
+        """(stage, seconds) in the order the stages happen"""
+        known = [(stage, self.stages[stage]) for stage in STAGES if stage in self.stages]
+        return known + [(stage, seconds) for stage, seconds in self.stages.items()
+                        if stage not in STAGES]
+
+
+class MetricsLog:
+    """
+    Append spans to a JSON lines file, rotating it when it gets too big.
+
+    When the file passes max_bytes it's renamed to FILE.1, FILE.1 to FILE.2
+    and so on, keeping at most `backups` old files.
+    """
+
+    def __init__(self, path, max_bytes=1024 * 1024, backups=3):
+        """Initialise the parameters"""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+
+    def write(self, span):
+        """Log one span"""
+        line = json.dumps(span.as_dict()) + '\n'
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                size = f.tell()
+            if size >= self.max_bytes:
+                self.rotate()
+
+    def rotate(self):
+        """Move the log files along one, dropping the oldest"""
+        for i in range(self.backups - 1, 0, -1):
+            older = '{}.{}'.format(self.path, i)
+            if os.path.exists(older):
+                os.replace(older, '{}.{}'.format(self.path, i + 1))
+        if self.backups > 0:
+            os.replace(self.path, self.path + '.1')
+        else:
+            os.remove(self.path)
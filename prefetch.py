@@ -0,0 +1,131 @@
+"""Start fetching an article while its title is still being typed."""
+
+import time
+from collections import deque
+
+from metrics import Span
+
+
+def prefetch_key(text):
+    """The title a guess will be fetched as"""
+    return text.lower()
+
+
+class Prefetcher:
+    """
+    Guess the next article from the text box and fetch it early.
+
+    Once the text has stopped changing for `delay` seconds the title is
+    fetched on the ArticleFetcher's workers. If the player then presses
+    Enter on the same title, the prefetch is handed over with `take`
+    instead of starting again. Any change to the text supersedes the older
+    prefetches: ones not yet started are cancelled and ones already running
+    are left to finish (they still fill the article cache) but never used.
+
+    At most `max_running` prefetches run at once and at most `max_bytes`
+    are downloaded per `window` seconds, so fast typists can't flood the
+    network.
+    """
+
+    def __init__(self, fetcher, delay=0.35, min_chars=3, max_running=1,
+                 max_bytes=4 * 2 ** 20, window=60):
+        """Initialise the parameters"""
+        self.fetcher = fetcher
+        self.delay = delay
+        self.min_chars = min_chars
+        self.max_running = max_running
+        self.max_bytes = max_bytes
+        self.window = window
+
+        self.text = ''
+        self.changed = None
+        # When the text last changed.
+        self.current = {}
+        # Title -> (future, span) for prefetches of the text in the box.
+        self.superseded = []
+        # (future, span) still running for text that has changed since.
+        self.spent = deque()
+        # (time, bytes) of finished prefetches in the last window.
+        self.started = 0
+        self.used = 0
+
+    def update(self, text, *args, now=None, **kwargs):
+        """Look at the text box after it's updated, prefetching if it's paused"""
+        now = time.monotonic() if now is None else now
+        self.collect(now)
+
+        key = prefetch_key(text)
+        if key != self.text:
+            self.text = key
+            self.changed = now
+            self.supersede()
+            return
+
+        if self.changed is None or now - self.changed < self.delay:
+            return
+        if len(key) < self.min_chars or key.startswith('\\') or key in self.current:
+            return
+        if self.running() >= self.max_running or self.spent_bytes() >= self.max_bytes:
+            return
+
+        span = Span(key)
+        future = self.fetcher.executor.submit(self.fetcher.fetch, key, *args, span=span, **kwargs)
+        self.current[key] = (future, span)
+        self.started += 1
+
+    def get_wait(self, now=None):
+        """Seconds until update should be called to start a prefetch, or None"""
+        now = time.monotonic() if now is None else now
+        if self.changed is None or self.text in self.current:
+            return None
+        if len(self.text) < self.min_chars or self.text.startswith('\\'):
+            return None
+        wait = self.changed + self.delay - now
+        return wait if wait > 0 else None
+        # Past the delay and not started means it's over budget.
+
+    def take(self, title):
+        """Return the (future, span) of a prefetch of a title, or None"""
+        prefetch = self.current.pop(prefetch_key(title), None)
+        if prefetch is None or prefetch[0].cancelled():
+            return None
+        self.used += 1
+        return prefetch
+
+    def supersede(self):
+        """Give up on every current prefetch"""
+        for future, span in self.current.values():
+            if not future.cancel():
+                self.superseded.append((future, span))
+                # Already running, can't be stopped.
+        self.current = {}
+
+    def cancel_all(self):
+        """Forget about the text box, e.g. when a game ends"""
+        self.supersede()
+        self.text = ''
+        self.changed = None
+
+    def running(self):
+        """The number of prefetches still running"""
+        futures = [future for future, _ in self.current.values()]
+        futures += [future for future, _ in self.superseded]
+        return sum(1 for future in futures if not future.done())
+
+    def collect(self, now):
+        """Count the bytes of finished prefetches and forget old ones"""
+        finished = [(future, span) for future, span in self.superseded if future.done()]
+        self.superseded = [prefetch for prefetch in self.superseded if not prefetch[0].done()]
+        for future, span in self.current.values():
+            if future.done() and not getattr(span, 'counted', False):
+                finished.append((future, span))
+        for _, span in finished:
+            if not getattr(span, 'counted', False):
+                span.counted = True
+                self.spent.append((now, span.counts.get('bytes_on_wire', 0)))
+        while self.spent and now - self.spent[0][0] > self.window:
+            self.spent.popleft()
+
+    def spent_bytes(self):
+        """Bytes downloaded by prefetches in the last window"""
+        return sum(size for _, size in self.spent)
@@ -45,6 +45,10 @@ class TextInput:
         # Text-surface will be created during the first update call:
         self.surface = pygame.Surface((1, 1))
         self.surface.set_alpha(0)
+        self.rendered_state = None # (text, cursor position, cursor visible, colour) last rendered
+        self.changed = True # True if the last update made a new surface
+        self.prefix = None # Text before the cursor, and its width in pixels
+        self.prefix_width = 0
 
         # Vars to make keydowns repeat after user pressed a key for some time:
         self.keyrepeat_counters = {} # {event.key: (counter_int, event.unicode)} (look for "***")
@@ -62,6 +66,7 @@ class TextInput:
         self.clock = pygame.time.Clock()
 
     def update(self, events):
+        elapsed_ms = self.clock.tick() # Time since the last update
         for event in events:
             if event.type == pygame.KEYDOWN:
                 self.cursor_visible = True # So the user sees where he writes
@@ -111,7 +116,7 @@ class TextInput:
 
         # Update key counters:
         for key in self.keyrepeat_counters :
-            self.keyrepeat_counters[key][0] += self.clock.get_time() # Update clock
+            self.keyrepeat_counters[key][0] += elapsed_ms # Update clock
             # Generate new key events if enough time has passed:
             if self.keyrepeat_counters[key][0] >= self.keyrepeat_intial_interval_ms:
                 self.keyrepeat_counters[key][0] = self.keyrepeat_intial_interval_ms - \
@@ -120,24 +125,45 @@ class TextInput:
                 event_key, event_unicode = key, self.keyrepeat_counters[key][1]
                 pygame.event.post(pygame.event.Event(pl.KEYDOWN, key=event_key, unicode=event_unicode))
 
-        # Rerender text surface:
-        self.surface = self.font_object.render(self.input_string, self.antialias, self.text_color)
-
         # Update self.cursor_visible
-        self.cursor_ms_counter += self.clock.get_time()
+        self.cursor_ms_counter += elapsed_ms
         if self.cursor_ms_counter >= self.cursor_switch_ms:
             self.cursor_ms_counter %= self.cursor_switch_ms
             self.cursor_visible = not self.cursor_visible
 
+        # Rerender text surface, only if the text, cursor or blink has changed:
+        state = (self.input_string, self.cursor_position, self.cursor_visible, self.text_color)
+        self.changed = state != self.rendered_state
+        if self.changed:
+            self.render()
+            self.rendered_state = state
+
+        return False
+
+    def render(self):
+        self.surface = self.font_object.render(self.input_string, self.antialias, self.text_color)
+
         if self.cursor_visible:
-            cursor_y_pos = self.font_object.size(self.input_string[:self.cursor_position])[0]
+            cursor_y_pos = self.get_prefix_width()
             # Without this, the cursor is invisible when self.cursor_position > 0:
             if self.cursor_position > 0:
                 cursor_y_pos -= self.cursor_surface.get_width()
             self.surface.blit(self.cursor_surface, (cursor_y_pos, 0))
 
-        self.clock.tick()
-        return False
+    def get_prefix_width(self):
+        # Width of the text before the cursor, measured again only when it changes
+        prefix = self.input_string[:self.cursor_position]
+        if prefix != self.prefix:
+            self.prefix = prefix
+            self.prefix_width = self.font_object.size(prefix)[0]
+        return self.prefix_width
+
+    def get_wait_ms(self):
+        # ms until update changes something without any new events, i.e. a blink or key repeat
+        wait_ms = self.cursor_switch_ms - self.cursor_ms_counter
+        for counter, _ in self.keyrepeat_counters.values():
+            wait_ms = min(wait_ms, self.keyrepeat_intial_interval_ms - counter)
+        return max(wait_ms, 0)
 
     def get_surface(self):
         return self.surface
@@ -153,6 +179,7 @@ class TextInput:
 
     def set_cursor_color(self, color):
         self.cursor_surface.fill(color)
+        self.rendered_state = None # Render again on the next update
 
     def clear_text(self):
         self.input_string=""
@@ -0,0 +1,45 @@
+"""Reuse rendered text surfaces between frames."""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    An LRU cache of text surfaces keyed on (text, colour, background).
+
+    Rendering text with a TrueType font is by far the most expensive part of
+    drawing a frame, and almost all of the text on screen is the same from
+    one frame to the next.
+    """
+
+    def __init__(self, font, max_entries=1024, antialias=True):
+        """Initialise the parameters"""
+        self.font = font
+        self.max_entries = max_entries
+        self.antialias = antialias
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color, bgcolor=None):
+        """Return a surface with the text drawn on it"""
+        key = (text, color, bgcolor)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if bgcolor is None:
+            surface = self.font.render(text, self.antialias, color)
+        else:
+            surface = self.font.render(text, self.antialias, color, bgcolor)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Forget every surface"""
+        self.surfaces.clear()
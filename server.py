@@ -0,0 +1,242 @@
+"""
+Host many games of Wikipedia Bingo at once, e.g. for a classroom.
+
+Clients connect over TCP and send one JSON object per line, getting one
+JSON object back per line:
+
+    {"cmd": "new", "board_size": 5, "limit": 5, "seed": 1}
+        -> {"game": 1, "state": {...}}
+    {"cmd": "guess", "game": 1, "title": "Ice | Glacier"}
+        -> {"game": 1, "articles": [...], "won": false, "state": {...}}
+    {"cmd": "state", "game": 1}
+    {"cmd": "end", "game": 1}
+
+Games last until they're ended or the connection that made them closes.
+When several players guess the same article at the same time it is only
+fetched and parsed once.
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from article_cache import normalise_title
+from article_fetch import FetchResult, fetch_article, split_titles
+from engine import BingoEngine
+from session import board_state
+
+
+def get_option(request, name, default, *types):
+    """Get a value from a request, checking it's one of the types it should be"""
+    value = request.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, types):
+        raise ValueError('{} should be {}, not {!r}'.format(
+            name, ' or '.join(kind.__name__ for kind in types), value))
+    return value
+
+
+class SingleFlight:
+    """
+    Share one fetch of an article between everyone asking for it at once.
+
+    While a title is being fetched anyone else asking for it waits for the
+    same result instead of starting another fetch. Once it's done the title
+    is forgotten, repeat guesses later on are left to the article cache.
+    """
+
+    def __init__(self, fetch, executor):
+        """Initialise the parameters"""
+        self.fetch = fetch
+        self.executor = executor
+        self.flights = {}
+        # Key -> future of the fetch in progress.
+        self.started = 0
+        self.shared = 0
+
+    async def get(self, key, *args, **kwargs):
+        """Fetch with fetch(*args, **kwargs), unless it's already being fetched"""
+        flight = self.flights.get(key)
+        if flight is None:
+            loop = asyncio.get_running_loop()
+            flight = loop.run_in_executor(self.executor,
+                                          functools.partial(self.fetch, *args, **kwargs))
+            self.flights[key] = flight
+            flight.add_done_callback(lambda _: self.land(key, flight))
+            self.started += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(flight)
+        # A client leaving doesn't cancel the fetch for everyone else.
+
+    def land(self, key, flight):
+        """Forget a finished fetch"""
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+
+
+class HostedGame:
+    """One game on the server."""
+
+    def __init__(self, game_id, engine):
+        """Initialise the parameters"""
+        self.id = game_id
+        self.engine = engine
+        self.lock = asyncio.Lock()
+        # Guesses at the same game are applied one at a time.
+
+    def state(self):
+        """The game as a JSON-friendly dictionary"""
+        state = board_state(self.engine)
+        state['won'] = self.engine.game_won()
+        if state['won']:
+            state['final_score'] = int(self.engine.scoring_algorithm())
+        return state
+
+
+class GameServer:
+    """
+    Run any number of games from one process.
+
+    Articles are fetched on a thread pool shared by every game, through a
+    SingleFlight so the same article is never being fetched twice at once.
+    Each game's guesses are applied in the order their titles were given,
+    exactly as in the pygame game.
+    """
+
+    def __init__(self, words, fetch=fetch_article, max_workers=8, wiki=0, max_batch=5,
+                 **options):
+        """Initialise the parameters"""
+        self.words = words
+        self.wiki = wiki
+        self.max_batch = max_batch
+        self.options = options
+        # Passed on to every fetch, e.g. cache, tokenizer and stream.
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self.flights = SingleFlight(fetch, self.executor)
+        self.games = {}
+        self.ids = itertools.count(1)
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Start listening, returning the port"""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and stop the fetch threads"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        """Answer one client until it disconnects"""
+        made = []
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = await self.respond(json.loads(line), made)
+                except (ValueError, KeyError, TypeError) as err:
+                    reply = {'error': '{}: {}'.format(type(err).__name__, err)}
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in made:
+                self.games.pop(game_id, None)
+            writer.close()
+
+    async def respond(self, request, made=None):
+        """Carry out one request"""
+        command = request['cmd']
+        if command == 'new':
+            game = self.new_game(get_option(request, 'board_size', 5, int),
+                                 get_option(request, 'limit', 5, int),
+                                 get_option(request, 'seed', None, int, type(None)))
+            if made is not None:
+                made.append(game.id)
+            return {'game': game.id, 'state': game.state()}
+
+        game = self.games[request['game']]
+        if command == 'guess':
+            return await self.guess(game, get_option(request, 'title', None, str))
+        if command == 'state':
+            return {'game': game.id, 'state': game.state()}
+        if command == 'end':
+            del self.games[game.id]
+            return {'game': game.id, 'ended': True}
+        raise ValueError('unknown command {!r}'.format(command))
+
+    def new_game(self, board_size=5, limit=5, seed=None):
+        """Start a game"""
+        game = HostedGame(next(self.ids), BingoEngine(self.words, board_size, limit, seed=seed))
+        self.games[game.id] = game
+        return game
+
+    async def fetch(self, title):
+        """Fetch an article, sharing the fetch with any other game that wants it"""
+        key = (self.wiki, normalise_title(title))
+        try:
+            validation = await self.flights.get(key, title, self.wiki, **self.options)
+        except Exception as err:
+            return FetchResult(title, error=err)
+        return FetchResult(title, validation=validation)
+
+    async def guess(self, game, text):
+        """Fetch the titles of a guess together and apply them in order"""
+        titles = split_titles(text, self.max_batch)
+        results = await asyncio.gather(*[self.fetch(title) for title in titles])
+
+        articles = []
+        async with game.lock:
+            for result in results:
+                if game.engine.game_won():
+                    break
+                counter = result.count_words(game.engine.board_index)
+                new_words = game.engine.apply_counts(result.title, counter, result.found)
+                articles.append({'title': result.title, 'found': result.found,
+                                 'messages': list(game.engine.message_array),
+                                 'new_words': list(new_words)})
+        state = game.state()
+        return {'game': game.id, 'articles': articles, 'won': state['won'], 'state': state}
+
+
+async def serve(server, host, port):
+    """Run a server until it's interrupted"""
+    port = await server.start(host, port)
+    print('Serving Wikipedia Bingo on {}:{}'.format(host, port))
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=8, help='articles fetched at once')
+    parser.add_argument('--words', default='no_stop_g2.txt', help='word list file')
+    parser.add_argument('--cache', default='article_cache', help='article cache directory')
+    parser.add_argument('--titles', default='titles.db', help='title index database')
+    args = parser.parse_args()
+
+    from article_cache import ArticleCache
+    from titles import TitleIndex
+    from word_generation import get_word_list
+    server = GameServer(get_word_list(args.words), max_workers=args.workers,
+                        cache=ArticleCache(args.cache), titles=TitleIndex(args.titles),
+                        tokenizer='fast', stream=True)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
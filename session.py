@@ -0,0 +1,228 @@
+"""
+Record games and replay them without a network or a window.
+
+A session file holds the seed and options of each game, the title of every
+guess with the board it led to, and the bytes of every article fetched.
+Replaying runs the articles back through Validation and the game rules as
+fast as they'll go, checks every board comes out the same and times each
+step, so a slow or wrong game can be reproduced exactly:
+
+    python game.py --record slow.session
+    python session.py slow.session
+"""
+
+import json
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+from article_cache import normalise_title
+from engine import BingoEngine
+from validate_numbers import Validation
+from word_generation import get_word_list
+
+
+MAGIC = b'WBSESSION1\n'
+RECORD = struct.Struct('>cI')
+# Record kind and payload length.
+GAME = b'G'
+TURN = b'T'
+ARTICLE = b'A'
+
+
+def board_state(engine):
+    """The parts of a game that a replay must reproduce"""
+    return {'words': engine.board_words.tolist(),
+            'counts': engine.board_counts.astype(int).tolist(),
+            'score': engine.score}
+
+
+class SessionRecorder:
+    """Append the games played, their guesses and the articles fetched to a file."""
+
+    def __init__(self, path):
+        """Initialise the parameters"""
+        self.path = path
+        self.lock = threading.Lock()
+        # Articles are recorded from the fetch threads.
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+
+    def write(self, kind, payload):
+        """Write one record"""
+        with self.lock:
+            self.file.write(RECORD.pack(kind, len(payload)))
+            self.file.write(payload)
+            self.file.flush()
+
+    def start_game(self, seed, board_size, limit, mode_choice, source, word_file):
+        """Record the options a new game was started with"""
+        game = {'seed': seed, 'board_size': board_size, 'limit': limit,
+                'mode': mode_choice, 'source': source, 'words': word_file}
+        self.write(GAME, json.dumps(game).encode('utf-8'))
+
+    def turn(self, title, engine):
+        """Record a guess and the board after it"""
+        turn = {'title': title, 'state': board_state(engine)}
+        self.write(TURN, json.dumps(turn).encode('utf-8'))
+
+    def command(self, command, engine):
+        """Record a command typed instead of a guess, e.g. \\add"""
+        turn = {'command': command, 'state': board_state(engine)}
+        self.write(TURN, json.dumps(turn).encode('utf-8'))
+
+    def article(self, mode, title, data):
+        """Record the bytes of a fetched article"""
+        header = json.dumps({'mode': mode, 'title': title}).encode('utf-8')
+        self.write(ARTICLE, header + b'\n' + zlib.compress(data))
+
+    def close(self):
+        """Close the file"""
+        with self.lock:
+            self.file.close()
+
+
+class RecordingCache:
+    """Wrap an ArticleCache so every article read or stored is recorded."""
+
+    def __init__(self, cache, recorder):
+        """Initialise the parameters"""
+        self.cache = cache
+        self.recorder = recorder
+
+    def get(self, mode, title):
+        data = self.cache.get(mode, title)
+        if data is not None:
+            self.recorder.article(mode, title, data)
+        return data
+
+    def put(self, mode, title, data):
+        self.recorder.article(mode, title, data)
+        self.cache.put(mode, title, data)
+
+    def put_compressed(self, mode, title, compressed):
+        self.recorder.article(mode, title, zlib.decompress(compressed))
+        self.cache.put_compressed(mode, title, compressed)
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+
+def read_session(path):
+    """Return the games in a session file and the articles they fetched"""
+    games = []
+    articles = {}
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{} is not a session file'.format(path))
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                break
+            kind, length = RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                break
+                # Cut short, e.g. the game was killed.
+            if kind == GAME:
+                game = json.loads(payload.decode('utf-8'))
+                game['turns'] = []
+                games.append(game)
+            elif kind == TURN:
+                games[-1]['turns'].append(json.loads(payload.decode('utf-8')))
+            elif kind == ARTICLE:
+                header, data = payload.split(b'\n', 1)
+                key = json.loads(header.decode('utf-8'))
+                articles[(str(key['mode']), normalise_title(key['title']))] = zlib.decompress(data)
+    return games, articles
+
+
+class ReplayCache:
+    """Serve recorded articles in place of an ArticleCache."""
+
+    def __init__(self, articles):
+        """Initialise the parameters"""
+        self.articles = articles
+
+    def get(self, mode, title):
+        return self.articles.get((str(mode), normalise_title(title)))
+
+    def put(self, mode, title, data):
+        pass
+
+    def put_compressed(self, mode, title, compressed):
+        pass
+
+
+class OfflineClient:
+    """An HTTPClient stand-in for replays, anything not recorded wasn't found."""
+
+    def get(self, url, span=None):
+        raise IOError('Not in the session: {}'.format(url))
+
+    def stream(self, url, span=None):
+        raise IOError('Not in the session: {}'.format(url))
+
+
+def replay(games, articles, words=None):
+    """
+    Play recorded games again and time each step of every guess.
+
+    Raises ValueError at the first board that differs from the recording.
+    Returns a list of {'title', 'fetch', 'process', 'count', 'apply'} times
+    in seconds. Html is tokenised as it's read, so that is part of fetch.
+    """
+    cache = ReplayCache(articles)
+    client = OfflineClient()
+    timings = []
+    for number, game in enumerate(games):
+        engine = BingoEngine(words if words is not None else get_word_list(game['words']),
+                             game['board_size'], game['limit'], seed=game['seed'])
+        for turn in game['turns']:
+            if turn.get('command') == 'add':
+                engine.board_counts += 1
+                continue
+            title = turn['title']
+            start = time.perf_counter()
+            validation = Validation(title, cache=cache, client=client, tokenizer='fast',
+                                    stream=True, source=game['source'])
+            try:
+                validation.scrape_wiki(game['mode'])
+                fetched = time.perf_counter()
+                validation.process_wiki()
+                found = True
+            except Exception:
+                fetched = time.perf_counter()
+                found = False
+            processed = time.perf_counter()
+            counter = validation.count_words(engine.board_index) if found else Counter()
+            counted = time.perf_counter()
+            engine.apply_counts(title, counter, found)
+            applied = time.perf_counter()
+
+            if board_state(engine) != turn['state']:
+                raise ValueError('Game {} differs from the recording after {!r}'.format(number, title))
+            timings.append({'title': title, 'fetch': fetched - start,
+                            'process': processed - fetched, 'count': counted - processed,
+                            'apply': applied - counted})
+    return timings
+
+
+def main():
+    games, articles = read_session(sys.argv[1])
+    timings = replay(games, articles)
+    steps = ['fetch', 'process', 'count', 'apply']
+    print('{:30} {}'.format('title', ' '.join('{:>8}'.format(step) for step in steps)))
+    for timing in timings:
+        print('{:30} {}'.format(timing['title'][:30],
+                                ' '.join('{:8.2f}'.format(timing[step] * 1000) for step in steps)))
+    totals = [sum(timing[step] for timing in timings) * 1000 for step in steps]
+    print('{:30} {}'.format('total (ms)', ' '.join('{:8.2f}'.format(t) for t in totals)))
+    print('{} games, {} guesses replayed identically'.format(len(games), len(timings)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Play many games at once to see how the board size and difficulty play out.
+
+Every game in a batch is a row of NumPy arrays (N x size x size word ids and
+counts), so a guess is applied to all of them at once: counts are added,
+overflowing words are replaced and won games are dropped from the batch.
+Batches are spread over processes to use every core.
+
+    python simulate.py --games 1000000
+    python simulate.py --store article_vectors
+
+Articles are random, not chosen by a player trying to hit board words, so
+the guesses needed are an upper bound on what people take. With --store,
+articles are drawn from ones that have been played before, otherwise from
+a Zipf model of word frequencies.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from engine import final_score
+
+BOARD_SIZES = [3, 5, 7]
+LIMITS = [7, 5, 3]
+# Easy, medium and hard.
+
+
+class ZipfArticles:
+    """
+    Articles whose word counts follow Zipf's law.
+
+    Word ids are ranks in the word list, which is sorted most common first.
+    An article has a log-normal number of board vocabulary words, and each
+    word's count is Poisson with a mean proportional to 1 / rank^exponent.
+    """
+
+    def __init__(self, vocab_size, exponent=1.0, median_words=1500, sigma=1.0):
+        """Initialise the parameters"""
+        self.vocab_size = vocab_size
+        self.median_words = median_words
+        self.sigma = sigma
+        weights = 1 / np.arange(1, vocab_size + 1) ** exponent
+        self.probabilities = weights / weights.sum()
+
+    def sample(self, word_ids, rng):
+        """Count the words in one new article per game (first axis of word_ids)"""
+        lengths = self.median_words * rng.lognormal(0, self.sigma, len(word_ids))
+        means = self.probabilities[word_ids] * lengths.reshape((-1,) + (1,) * (word_ids.ndim - 1))
+        return rng.poisson(means)
+
+
+class StoredArticles:
+    """Articles drawn at random from the counts in a VocabStore."""
+
+    def __init__(self, store):
+        """Initialise the parameters"""
+        self.vocab_size = len(store.words)
+        keys = list(store.index)
+        if not keys:
+            raise ValueError('No articles in {}'.format(store.directory))
+        self.counts = np.zeros((len(keys), self.vocab_size), dtype=np.uint16)
+        for row, key in enumerate(keys):
+            ids, counts = store.vector(key)
+            self.counts[row, ids] = np.minimum(counts, np.iinfo(np.uint16).max)
+
+    def sample(self, word_ids, rng):
+        """Count the words in one new article per game (first axis of word_ids)"""
+        articles = rng.integers(0, len(self.counts), len(word_ids))
+        rows = articles.reshape((-1,) + (1,) * (word_ids.ndim - 1))
+        return self.counts[rows, word_ids]
+
+
+def unique_rows(word_ids, vocab_size, rng):
+    """Redraw ids until no game has the same word twice on its board"""
+    flat = word_ids.reshape(len(word_ids), -1)
+    while True:
+        order = np.sort(flat, axis=1)
+        repeated = order[:, 1:] == order[:, :-1]
+        if not repeated.any():
+            return word_ids
+        for game in np.flatnonzero(repeated.any(axis=1)):
+            row = flat[game]
+            _, first = np.unique(row, return_index=True)
+            again = np.setdiff1d(np.arange(len(row)), first)
+            row[again] = rng.integers(0, vocab_size, len(again))
+
+
+def replace_words(ids, overflow, vocab_size, rng):
+    """Give overflowed words new ids that aren't on the board, and never themselves"""
+    old = ids.copy()
+    new = rng.integers(0, vocab_size - 1, overflow.sum())
+    ids[overflow] = new + (new >= old[overflow])
+    # Drawn from every id but the old one, as a WordPool does.
+
+    flat = ids.reshape(len(ids), -1)
+    order = np.sort(flat, axis=1)
+    repeated = (order[:, 1:] == order[:, :-1]).any(axis=1)
+    for game in np.flatnonzero(repeated):
+        row = flat[game]
+        old_row = old[game].reshape(-1)
+        for cell in np.flatnonzero(overflow[game].reshape(-1)):
+            while (row == row[cell]).sum() > 1:
+                new = rng.integers(0, vocab_size - 1)
+                row[cell] = new + (new >= old_row[cell])
+    return ids
+
+
+def simulate_batch(games, board_size, limit, articles, seed, max_guesses=1000):
+    """
+    Play a batch of games to the end.
+
+    Returns the number of guesses each game took to win, or 0 if it hadn't
+    won after max_guesses.
+    """
+    rng = np.random.default_rng(seed)
+    vocab_size = articles.vocab_size
+    shape = (games, board_size, board_size)
+    word_ids = unique_rows(rng.integers(0, vocab_size, shape), vocab_size, rng)
+    counts = np.zeros(shape, dtype=np.int64)
+    guesses = np.zeros(games, dtype=np.int64)
+    playing = np.arange(games)
+
+    for guess in range(1, max_guesses + 1):
+        if len(playing) == 0:
+            break
+        ids = word_ids[playing]
+        new_counts = counts[playing] + articles.sample(ids, rng)
+
+        # Overflowing words go back to zero and are replaced
+        overflow = new_counts >= limit
+        if overflow.any():
+            new_counts[overflow] = 0
+            ids = replace_words(ids, overflow, vocab_size, rng)
+            word_ids[playing] = ids
+        counts[playing] = new_counts
+
+        # A full row or column wins
+        found = new_counts > 0
+        won = found.all(axis=2).any(axis=1) | found.all(axis=1).any(axis=1)
+        guesses[playing[won]] = guess
+        playing = playing[~won]
+
+    return guesses
+
+
+def simulate(games, board_size, limit, articles, seed=0, processes=None, batch_size=20000,
+             max_guesses=1000):
+    """Play games in batches spread over processes and return all their guess counts"""
+    sizes = [batch_size] * (games // batch_size)
+    if games % batch_size:
+        sizes.append(games % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(size, board_size, limit, articles, batch_seed, max_guesses)
+            for size, batch_seed in zip(sizes, seeds)]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) == 1:
+        results = [simulate_batch(*job) for job in jobs]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(simulate_batch, jobs)
+    return np.concatenate(results)
+
+
+def summarise(guesses, board_size, limit):
+    """Percentiles of guesses to win and of the final score"""
+    won = guesses[guesses > 0]
+    summary = {'games': len(guesses), 'won': len(won)}
+    if len(won):
+        percentiles = [10, 25, 50, 75, 90, 99]
+        summary['guesses'] = dict(zip(percentiles, np.percentile(won, percentiles)))
+        summary['mean'] = won.mean()
+        summary['score'] = dict(zip(percentiles,
+                                    np.percentile(final_score(board_size, limit, won),
+                                                  percentiles)))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--games', type=int, default=100000, help='games per setting')
+    parser.add_argument('--sizes', type=int, nargs='+', default=BOARD_SIZES)
+    parser.add_argument('--limits', type=int, nargs='+', default=LIMITS)
+    parser.add_argument('--store', help='draw articles from this VocabStore directory')
+    parser.add_argument('--words', default='no_stop_g2.txt', help='word list file')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    from word_generation import get_word_list
+    words = [word for word in get_word_list(args.words) if word]
+    if args.store:
+        from vocab_store import VocabStore
+        articles = StoredArticles(VocabStore(args.store, words))
+    else:
+        articles = ZipfArticles(len(words))
+
+    print('{:>4} {:>5} {:>9} {:>7} {:>6} {:>6} {:>6} {:>6} {:>6} {:>8} {:>7}'.format(
+        'size', 'limit', 'games', 'won', 'p10', 'p50', 'p90', 'p99', 'mean', 'score50', 'secs'))
+    for board_size in args.sizes:
+        for limit in args.limits:
+            start = time.perf_counter()
+            guesses = simulate(args.games, board_size, limit, articles,
+                               seed=args.seed, processes=args.processes)
+            elapsed = time.perf_counter() - start
+            summary = summarise(guesses, board_size, limit)
+            if 'guesses' not in summary:
+                print('{:>4} {:>5} {:>9} {:>7}'.format(board_size, limit, summary['games'], 0))
+                continue
+            g = summary['guesses']
+            print('{:>4} {:>5} {:>9} {:>7} {:>6.0f} {:>6.0f} {:>6.0f} {:>6.0f} {:>6.1f} {:>8.0f} {:>7.2f}'
+                  .format(board_size, limit, summary['games'], summary['won'], g[10], g[50], g[90],
+                          g[99], summary['mean'], summary['score'][50], elapsed))
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
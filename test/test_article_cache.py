@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest as un
+
+import article_cache as ac
+import validate_numbers as vn
+from wiki_server import StandInWiki
+
+
+class TestArticleCache(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        """Test pages are stored and counted as hits"""
+        cache = ac.ArticleCache(self.directory)
+        self.assertIsNone(cache.get(0, 'Ice'))
+        cache.put(0, 'Ice', b'<p>frozen water</p>')
+        self.assertEqual(cache.get(0, ' ice '), b'<p>frozen water</p>')
+        self.assertIsNone(cache.get(1, 'Ice'))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_reload(self):
+        """Test a new cache sees files written by an earlier one"""
+        ac.ArticleCache(self.directory).put(0, 'Germany', b'country')
+        cache = ac.ArticleCache(self.directory)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertEqual(cache.get(0, 'germany'), b'country')
+
+    def test_shared_directory(self):
+        """Test pages written by another process count towards the size limit"""
+        first = ac.ArticleCache(self.directory)
+        second = ac.ArticleCache(self.directory)
+        first.put(0, 'Ice', os.urandom(3000))
+        self.assertIsNotNone(second.get(0, 'Ice'))
+        self.assertEqual(second.stats()['bytes'], first.stats()['bytes'])
+        second.max_bytes = first.stats()['bytes'] + 100
+        second.put(0, 'Glacier', os.urandom(3000))
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+        self.assertEqual(second.stats()['bytes'],
+                         sum(os.path.getsize(os.path.join(self.directory, name))
+                             for name in os.listdir(self.directory)))
+
+    def test_ttl(self):
+        """Test old pages expire"""
+        cache = ac.ArticleCache(self.directory, ttl=-1)
+        cache.put(0, 'Ice', b'old')
+        self.assertIsNone(cache.get(0, 'Ice'))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_lru_eviction(self):
+        """Test the least recently used page goes first"""
+        page = os.urandom(1000)
+        cache = ac.ArticleCache(self.directory, max_bytes=2500)
+        cache.put(0, 'a', page)
+        cache.put(0, 'b', page)
+        cache.get(0, 'a')
+        cache.put(0, 'c', page)
+        self.assertIsNotNone(cache.get(0, 'a'))
+        self.assertIsNone(cache.get(0, 'b'))
+        self.assertIsNotNone(cache.get(0, 'c'))
+        self.assertLessEqual(cache.stats()['bytes'], 2500)
+
+    def test_validation_uses_cache(self):
+        """Test a cached page is parsed without downloading"""
+        cache = ac.ArticleCache(self.directory)
+        cache.put(0, 'Ice', b'<html><body><p>Ice is frozen water.</p></body></html>')
+        val = vn.Validation('Ice', cache=cache)
+        val.download = None
+        val.scrape_wiki()
+        self.assertEqual(val.page_text, 'Ice is frozen water.')
+
+    def test_streamed_page(self):
+        """Test a page tokenised as it downloads is cached whole"""
+        page = b'<html><body>' + b'<p>Ice is frozen water.</p>' * 5000 + b'</body></html>'
+        cache = ac.ArticleCache(self.directory)
+        with StandInWiki({'/wiki/Ice': page}) as wiki:
+            val = vn.Validation('Ice', cache=cache, tokenizer='fast', stream=True)
+            val.modes = [wiki.url + '/wiki/']
+            val.scrape_wiki()
+            val.process_wiki()
+        self.assertTrue(val.token)
+        self.assertEqual(cache.get(0, 'Ice'), page)
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest as un
+
+import article_fetch as af
+
+
+class FakeValidation:
+    def __init__(self, token):
+        self.token = token
+
+
+class TestArticleFetcher(un.TestCase):
+
+    def wait_for(self, fetcher, n):
+        results = []
+        deadline = time.time() + 5
+        while len(results) < n and time.time() < deadline:
+            results += fetcher.poll()
+            time.sleep(0.01)
+        return results
+
+    def test_results_in_submission_order(self):
+        """Test slow fetches don't overtake later ones"""
+        def fetch(title):
+            time.sleep(0.1 if title == 'slow' else 0)
+            return FakeValidation([title])
+
+        fetcher = af.ArticleFetcher(max_workers=2, fetch=fetch)
+        fetcher.submit('slow')
+        fetcher.submit('fast')
+        self.assertTrue(fetcher.busy)
+        results = self.wait_for(fetcher, 2)
+        self.assertEqual([r.title for r in results], ['slow', 'fast'])
+        self.assertEqual(results[1].token, ['fast'])
+        self.assertFalse(fetcher.busy)
+        fetcher.shutdown()
+
+    def test_errors_are_returned(self):
+        """Test a failed fetch is reported as not found"""
+        def fetch(title):
+            raise IOError('404')
+
+        fetcher = af.ArticleFetcher(fetch=fetch)
+        fetcher.submit('missing')
+        result, = self.wait_for(fetcher, 1)
+        self.assertFalse(result.found)
+        self.assertEqual(result.token, [])
+        fetcher.shutdown()
+
+    def test_cancel_all(self):
+        """Test cancelled fetches are never handed back"""
+        release = threading.Event()
+
+        def fetch(title):
+            release.wait(5)
+            return FakeValidation([title])
+
+        fetcher = af.ArticleFetcher(max_workers=1, fetch=fetch)
+        fetcher.submit('a')
+        fetcher.submit('b')
+        fetcher.cancel_all()
+        release.set()
+        self.assertFalse(fetcher.busy)
+        self.assertEqual(fetcher.poll(), [])
+        fetcher.shutdown()
+
+    def test_notify(self):
+        """Test the game is told as each fetch finishes"""
+        done = threading.Semaphore(0)
+        fetcher = af.ArticleFetcher(fetch=FakeValidation, notify=done.release)
+        fetcher.submit('a')
+        fetcher.submit('b')
+        self.assertTrue(done.acquire(timeout=5) and done.acquire(timeout=5))
+        self.assertEqual(len(fetcher.poll()), 2)
+        fetcher.shutdown()
+
+    def test_batch_is_concurrent(self):
+        """Test a batch takes as long as its slowest fetch, not the sum"""
+        def fetch(title):
+            time.sleep(0.2)
+            return FakeValidation([title])
+
+        titles = af.split_titles('Ice | Glacier|  | antarctica | ice', limit=3)
+        self.assertEqual(titles, ['ice', 'glacier', 'antarctica'])
+        fetcher = af.ArticleFetcher(max_workers=3, fetch=fetch)
+        start = time.perf_counter()
+        for title in titles:
+            fetcher.submit(title)
+        results = self.wait_for(fetcher, 3)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual([r.title for r in results], titles)
+        fetcher.shutdown()
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest as un
+
+import assets as at
+
+
+class TestAssetManager(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'instructions.txt')
+        with open(self.path, 'w') as f:
+            f.write('first')
+        self.manager = at.AssetManager(check_interval=0)
+        self.manager.register('text', self.path, self.read)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def read(path):
+        with open(path) as f:
+            return f.read()
+
+    def test_loaded_once(self):
+        """Test an unchanged file isn't loaded again"""
+        for _ in range(5):
+            self.assertEqual(self.manager.get('text'), 'first')
+        self.assertEqual(self.manager.loads, 1)
+
+    def test_mtime_change(self):
+        """Test a changed file is loaded again"""
+        self.manager.get('text')
+        with open(self.path, 'w') as f:
+            f.write('second')
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.manager.get('text'), 'second')
+        self.assertEqual(self.manager.loads, 2)
+
+    def test_invalidate(self):
+        """Test an invalidated asset is loaded again"""
+        self.manager.get('text')
+        self.manager.invalidate('text')
+        self.manager.get('text')
+        self.assertEqual(self.manager.loads, 2)
+
+    def test_check_interval(self):
+        """Test the file isn't checked again until the interval has passed"""
+        manager = at.AssetManager(check_interval=60)
+        manager.register('text', self.path, self.read)
+        manager.get('text')
+        with open(self.path, 'w') as f:
+            f.write('second')
+        self.assertEqual(manager.get('text'), 'first')
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,35 @@
+import unittest as un
+
+import numpy as np
+
+import board as bd
+
+
+class TestBoard(un.TestCase):
+
+    def setUp(self):
+        words = np.array([['ice', 'snow'], ['water', 'cold']], dtype=object)
+        self.index = bd.BoardIndex(words)
+
+    def test_index(self):
+        """Test words map to their tiles"""
+        self.assertEqual(self.index['water'], (1, 0))
+        self.assertIn('cold', self.index)
+        self.assertNotIn('hot', self.index)
+
+    def test_replace(self):
+        """Test replacing a word keeps its tile"""
+        self.index.replace('snow', 'hail')
+        self.assertNotIn('snow', self.index)
+        self.assertEqual(self.index['hail'], (0, 1))
+        self.assertEqual(len(self.index), 4)
+
+    def test_count(self):
+        """Test counting is case insensitive and keeps first-seen order"""
+        tokens = ['Water', 'is', 'cold', 'ICE', 'water', 'ice', 'the']
+        counts = bd.count_board_words(tokens, self.index)
+        self.assertEqual(list(counts.items()), [('water', 2), ('cold', 1), ('ice', 2)])
+
+
+if __name__ == '__main__':
+    un.main()
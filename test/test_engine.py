@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import unittest as un
+from collections import Counter
+
+import engine as en
+
+WORDS = ['ice', 'snow', 'water', 'cold', 'glacier', 'frozen', 'winter', 'polar',
+         'arctic', 'melt', 'hail', 'sleet', 'frost', 'crystal']
+
+
+class TestBingoEngine(un.TestCase):
+
+    def setUp(self):
+        self.engine = en.BingoEngine(WORDS, board_size=3, limit=3, seed=0)
+
+    def test_board(self):
+        """Test the board is filled with different words"""
+        words = list(self.engine.board_words.flatten())
+        self.assertEqual(len(set(words)), 9)
+        self.assertEqual(len(self.engine.board_index), 9)
+        self.assertTrue((self.engine.board_limits == 3).all())
+
+    def test_seed(self):
+        """Test a game can be repeated from its seed"""
+        other = en.BingoEngine(WORDS, board_size=3, limit=3, seed=0)
+        self.assertEqual(other.board_words.tolist(), self.engine.board_words.tolist())
+
+    def test_overflow(self):
+        """Test an overflowing word is replaced and reported after its count"""
+        first, second = self.engine.board_words[0][0], self.engine.board_words[1][2]
+        new_words = self.engine.apply_counts('ice', Counter({first: 2, second: 4}))
+
+        messages = self.engine.message_array
+        self.assertEqual(messages[:3], ['ice:',
+                                        '{} (0)+4 = 4/3'.format(second),
+                                        '  OVERFLOW > {}'.format(new_words[0])])
+        self.assertEqual(messages[3], '{} (0)+2 = 2/3'.format(first))
+        self.assertEqual(self.engine.board_words[1][2], new_words[0])
+        self.assertEqual(self.engine.board_index[new_words[0]], (1, 2))
+        self.assertNotIn(second, self.engine.board_index)
+        self.assertEqual(self.engine.board_counts[1][2], 0)
+        self.assertEqual(self.engine.board_counts[0][0], 2)
+        self.assertEqual(self.engine.board_new.sum(), 1)
+        self.assertEqual(self.engine.score, 1)
+
+    def test_not_found(self):
+        """Test the messages for a missing article"""
+        self.engine.apply_counts('nothing', Counter(), found=False)
+        self.assertEqual(self.engine.message_array,
+                         ['nothing:', 'Article not found', 'No valid words'])
+
+    def test_batch(self):
+        """Test every article of a guess keeps its messages on screen"""
+        first, second = self.engine.board_words[0][0], self.engine.board_words[1][2]
+        self.engine.start_batch(['ice', 'snow'])
+        self.assertEqual(self.engine.message_array, ['ice | snow:'])
+        new_words = self.engine.apply_counts('ice', Counter({first: 3}))
+        self.engine.apply_counts('snow', Counter({second: 1}))
+        self.assertEqual(self.engine.message_array,
+                         ['ice:', '{} (0)+3 = 3/3'.format(first),
+                          '  OVERFLOW > {}'.format(new_words[0]),
+                          'snow:', '{} (0)+1 = 1/3'.format(second)])
+        self.assertEqual(self.engine.board_new[0][0], 1)
+
+        self.engine.start_batch(['water'])
+        self.engine.apply_counts('water', Counter())
+        self.assertEqual(self.engine.message_array, ['water:', 'No valid words'])
+        self.assertEqual(self.engine.board_new.sum(), 0)
+
+    def test_win(self):
+        """Test filling a column wins and scores"""
+        self.assertFalse(self.engine.game_won())
+        column = Counter({word: 1 for word in self.engine.board_words[2]})
+        self.engine.apply_counts('ice', column)
+        self.engine.apply_counts('snow', Counter())
+        self.assertTrue(self.engine.game_won())
+        self.assertEqual(self.engine.scoring_algorithm(), int((2000 + 4000) / 3))
+
+    def test_no_pygame(self):
+        """Test the engine can be used without pygame"""
+        check = 'import sys, engine; print("pygame" in sys.modules)'
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', check], cwd=root,
+                                stdout=subprocess.PIPE, check=True)
+        self.assertEqual(result.stdout.strip(), b'False')
+
+
+if __name__ == '__main__':
+    un.main()
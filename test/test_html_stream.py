@@ -0,0 +1,62 @@
+import os
+import unittest as un
+
+import html_stream as hs
+import validate_numbers as vn
+from wiki_server import StandInWiki
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PAGES = ['ice', 'glacier', 'germany']
+
+
+def read_page(name):
+    with open(os.path.join(HERE, 'pages', name + '.html'), 'rb') as f:
+        return f.read()
+
+
+def parsed_tokens(data):
+    """Tokens from the BeautifulSoup path"""
+    val = vn.Validation('page', tokenizer='fast')
+    val.parse_page(data)
+    val.process_wiki()
+    return val.token
+
+
+class TestStreamingExtractor(un.TestCase):
+
+    def test_matches_soup(self):
+        """Test streaming gives the same tokens as parsing the whole page"""
+        for name in PAGES:
+            data = read_page(name)
+            expected = parsed_tokens(data)
+            for size in [7, 100, 64 * 1024]:
+                extractor = hs.StreamingExtractor(batch_chars=50)
+                for chunk in hs.iter_chunks(data, size):
+                    extractor.feed_bytes(chunk)
+                self.assertEqual(extractor.close(), expected, (name, size))
+
+    def test_split_references(self):
+        """Test [edit] and [n] split across chunks are removed"""
+        data = '<p>cold water<span>[</span>12]</p>\n<h2>Ice<span>[<a>edit</a>]</span></h2>'
+        tokens = hs.stream_tokens(hs.iter_chunks(data.encode('utf-8'), 3))
+        self.assertEqual(tokens, ['cold', 'water', 'ice'])
+
+    def test_hidden_text(self):
+        """Test scripts, styles and comments are skipped"""
+        data = b'<script>var ice=1;</script><style>p{}</style><!-- snow --><p>Rain &amp; hail</p>'
+        self.assertEqual(hs.stream_tokens([data]), ['rain', 'hail'])
+
+    def test_validation(self):
+        """Test Validation streams straight from the network"""
+        data = read_page('ice')
+        with StandInWiki({'/wiki/Ice': data}) as wiki:
+            val = vn.Validation('Ice', tokenizer='fast', stream=True)
+            val.modes = [wiki.url + '/wiki/']
+            val.scrape_wiki()
+            val.process_wiki()
+        self.assertIsNone(val.page_text)
+        self.assertEqual(val.token, parsed_tokens(data))
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,63 @@
+import unittest as un
+
+import http_client as hc
+import validate_numbers as vn
+from wiki_server import StandInWiki
+
+PAGE = b'<html><body><p>' + b'Ice is frozen water. ' * 500 + b'</p></body></html>'
+
+
+class TestHTTPClient(un.TestCase):
+
+    def test_gzip_keep_alive(self):
+        """Test pages are decompressed over one reused connection"""
+        with StandInWiki({'/wiki/Ice': PAGE}) as wiki:
+            client = hc.HTTPClient()
+            for _ in range(3):
+                self.assertEqual(client.get(wiki.url + '/wiki/Ice'), PAGE)
+            client.close()
+
+        stats = client.stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(len(wiki.clients), 1)
+        self.assertEqual(stats['bytes_decoded'], 3 * len(PAGE))
+        self.assertLess(stats['bytes_on_wire'], stats['bytes_decoded'] / 10)
+
+    def test_identity(self):
+        """Test uncompressed responses"""
+        with StandInWiki({'/wiki/Ice': PAGE}, gzip=False) as wiki:
+            client = hc.HTTPClient()
+            self.assertEqual(client.get(wiki.url + '/wiki/Ice'), PAGE)
+            client.close()
+        self.assertEqual(client.stats()['bytes_on_wire'], len(PAGE))
+
+    def test_redirect(self):
+        """Test redirects are followed"""
+        with StandInWiki({'/wiki/Ice': PAGE}, {'/wiki/ICE': '/wiki/Ice'}) as wiki:
+            client = hc.HTTPClient()
+            self.assertEqual(client.get(wiki.url + '/wiki/ICE'), PAGE)
+            client.close()
+
+    def test_not_found(self):
+        """Test missing pages raise an error"""
+        with StandInWiki() as wiki:
+            client = hc.HTTPClient()
+            with self.assertRaises(hc.HTTPError) as err:
+                client.get(wiki.url + '/wiki/Nothing')
+            self.assertEqual(err.exception.status, 404)
+            client.close()
+
+    def test_validation(self):
+        """Test Validation downloads through the client"""
+        with StandInWiki({'/wiki/Ice_cream': PAGE}) as wiki:
+            client = hc.HTTPClient()
+            val = vn.Validation('Ice cream', client=client)
+            val.modes = [wiki.url + '/wiki/']
+            val.scrape_wiki()
+            client.close()
+        self.assertTrue(val.page_text.startswith('Ice is frozen water.'))
+
+
+if __name__ == '__main__':
+    un.main()
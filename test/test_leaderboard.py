@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest as un
+
+import leaderboard as lb
+
+
+class TestLeaderboard(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'leaderboard.db')
+        self.csv_path = os.path.join(self.directory, 'leaderboard.csv')
+        with open(self.csv_path, 'w') as f:
+            f.write('score,name\n446,mar\n3333,tst\n27,hel\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_import_once(self):
+        """Test the csv scores are copied in only the first time"""
+        board = lb.Leaderboard(self.path, csv_path=self.csv_path)
+        self.assertEqual(board.top(2), [(3333, 'tst'), (446, 'mar')])
+        board = lb.Leaderboard(self.path, csv_path=self.csv_path)
+        self.assertEqual(len(board), 3)
+
+    def test_add(self):
+        """Test new scores are ranked with the old ones"""
+        board = lb.Leaderboard(self.path, csv_path=self.csv_path)
+        board.add(500, 'new')
+        board.add(500, 'tie')
+        self.assertEqual(board.top(4), [(3333, 'tst'), (500, 'new'), (500, 'tie'), (446, 'mar')])
+
+    def test_missing_csv(self):
+        """Test a leaderboard can start empty"""
+        board = lb.Leaderboard(self.path, csv_path=os.path.join(self.directory, 'none.csv'))
+        self.assertEqual(board.top(), [])
+
+    def test_concurrent_add(self):
+        """Test games adding scores at the same time don't lose any"""
+        lb.Leaderboard(self.path)
+
+        def play(i):
+            board = lb.Leaderboard(self.path)
+            for j in range(20):
+                board.add(i * 100 + j, 'p{}'.format(i))
+
+        threads = [threading.Thread(target=play, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(lb.Leaderboard(self.path)), 80)
+
+
+if __name__ == '__main__':
+    un.main()
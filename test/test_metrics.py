@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest as un
+
+import http_client as hc
+import metrics as mt
+import validate_numbers as vn
+from board import BoardIndex
+from wiki_server import StandInWiki
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(HERE, 'pages', 'ice.html'), 'rb') as f:
+    PAGE = f.read()
+
+
+class TestMetrics(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fetch(self, stream):
+        span = mt.Span('Ice')
+        with StandInWiki({'/wiki/Ice': PAGE}) as wiki:
+            client = hc.HTTPClient()
+            val = vn.Validation('Ice', client=client, tokenizer='fast', stream=stream, span=span)
+            val.modes = [wiki.url + '/wiki/']
+            val.scrape_wiki()
+            val.process_wiki()
+            val.count_words(BoardIndex([['ice', 'water']]))
+            client.close()
+        span.finish()
+        return val, span
+
+    def test_stream_stages(self):
+        """Test every stage of a streamed guess is timed"""
+        val, span = self.fetch(stream=True)
+        for stage in ['connect', 'request', 'download', 'decode', 'parse', 'tokenize', 'match']:
+            self.assertIn(stage, span.stages)
+        self.assertEqual(span.counts['tokens'], len(val.token))
+        self.assertEqual(span.counts['bytes'], len(PAGE))
+        self.assertLess(span.counts['bytes_on_wire'], len(PAGE))
+        self.assertLessEqual(sum(span.stages.values()), span.total)
+
+    def test_soup_stages(self):
+        """Test the stages of a guess parsed with BeautifulSoup"""
+        _, span = self.fetch(stream=False)
+        self.assertEqual([stage for stage, _ in span.ordered_stages()],
+                         ['connect', 'request', 'download', 'decode', 'parse', 'clean',
+                          'tokenize', 'match'])
+
+    def test_log_rotation(self):
+        """Test the log is rotated and old files are dropped"""
+        path = os.path.join(self.directory, 'metrics.jsonl')
+        log = mt.MetricsLog(path, max_bytes=300, backups=2)
+        for i in range(20):
+            span = mt.Span('page {}'.format(i))
+            span.add('download', 0.01)
+            span.finish()
+            log.write(span)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['metrics.jsonl', 'metrics.jsonl.1', 'metrics.jsonl.2'])
+        with open(path + '.1') as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record['stages_ms'], {'download': 10.0})
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,106 @@
+import threading
+import unittest as un
+
+import article_fetch as af
+import prefetch as pf
+
+
+class StubFetch:
+    """Pretend to fetch articles, each finishing when it's released"""
+
+    def __init__(self, size=1000):
+        self.size = size
+        self.titles = []
+        self.release = threading.Event()
+
+    def __call__(self, title, span=None):
+        self.titles.append(title)
+        self.release.wait(5)
+        span.count('bytes_on_wire', self.size)
+        return title.upper()
+
+
+class TestPrefetcher(un.TestCase):
+
+    def setUp(self):
+        self.fetch = StubFetch()
+        self.fetcher = af.ArticleFetcher(max_workers=1, fetch=self.fetch)
+        self.prefetcher = pf.Prefetcher(self.fetcher, delay=0.3)
+
+    def tearDown(self):
+        self.fetch.release.set()
+        self.fetcher.shutdown()
+
+    def type(self, text, start, end):
+        """Call update every frame from start to end"""
+        now = start
+        while now <= end:
+            self.prefetcher.update(text, now=now)
+            now += 0.05
+
+    def test_debounce(self):
+        """Test nothing is fetched until typing pauses"""
+        for i, text in enumerate(['g', 'gl', 'gla', 'glac', 'glaci', 'glacie', 'glacier']):
+            self.type(text, i * 0.1, i * 0.1 + 0.05)
+        self.assertEqual(self.prefetcher.started, 0)
+        self.type('glacier', 0.7, 1.2)
+        self.assertEqual(self.prefetcher.started, 1)
+        self.fetch.release.set()
+        self.fetcher.executor.submit(lambda: None).result()
+        self.assertEqual(self.fetch.titles, ['glacier'])
+
+    def test_wait(self):
+        """Test the game is told when to look at the text box again"""
+        self.assertIsNone(self.prefetcher.get_wait(now=0))
+        self.prefetcher.update('ic', now=0)
+        self.assertIsNone(self.prefetcher.get_wait(now=0.1))
+        self.prefetcher.update('ice', now=0.1)
+        self.assertAlmostEqual(self.prefetcher.get_wait(now=0.2), 0.2)
+        self.prefetcher.update('ice', now=0.4)
+        self.assertIsNone(self.prefetcher.get_wait(now=0.5))
+        # Started, nothing more to do
+
+    def test_take(self):
+        """Test Enter uses an in-flight prefetch, in submission order"""
+        self.type('Ice', 0, 0.5)
+        future, span = self.prefetcher.take('ice')
+        self.fetcher.adopt('ice', future, span)
+        self.assertIsNone(self.prefetcher.take('ice'))
+        self.fetch.release.set()
+        future.result()
+        result, = self.fetcher.poll()
+        self.assertEqual((result.title, result.validation), ('ice', 'ICE'))
+        self.assertEqual(span.counts['bytes_on_wire'], 1000)
+        self.assertEqual(self.fetch.titles, ['ice'])
+
+    def test_superseded(self):
+        """Test a changed title isn't used and limits the prefetches running"""
+        self.type('ice', 0, 0.5)
+        self.type('glacier', 0.5, 1.5)
+        self.assertIsNone(self.prefetcher.take('ice'))
+        self.assertIsNone(self.prefetcher.take('glacier'))
+        # Still waiting for the ice prefetch to finish.
+        self.assertEqual(self.prefetcher.started, 1)
+        self.fetch.release.set()
+        self.fetcher.executor.submit(lambda: None).result()
+        self.type('glacier', 1.5, 2.0)
+        self.assertEqual(self.prefetcher.started, 2)
+
+    def test_byte_budget(self):
+        """Test prefetching stops once the byte budget is spent"""
+        self.fetch.release.set()
+        self.prefetcher.max_bytes = 1500
+        for i, title in enumerate(['ice', 'glacier', 'snow']):
+            self.type(title, i, i + 0.5)
+            self.fetcher.executor.submit(lambda: None).result()
+        self.type('snow', 3, 3.5)
+        self.assertEqual(self.fetch.titles, ['ice', 'glacier'])
+        self.assertEqual(self.prefetcher.spent_bytes(), 2000)
+        # After the window the budget is back
+        self.type('snow', 70, 70.5)
+        self.fetcher.executor.submit(lambda: None).result()
+        self.assertEqual(self.fetch.titles, ['ice', 'glacier', 'snow'])
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,33 @@
+import unittest as un
+
+import pygame
+
+import render_cache as rc
+
+
+class TestTextCache(un.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.cache = rc.TextCache(pygame.font.Font(None, 20), max_entries=2)
+
+    def test_reuse(self):
+        """Test the same text gives back the same surface"""
+        first = self.cache.render('ice', (0, 0, 0))
+        self.assertIs(self.cache.render('ice', (0, 0, 0)), first)
+        self.assertIsNot(self.cache.render('ice', (0, 0, 255)), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_evict(self):
+        """Test the least recently used surface is dropped"""
+        ice = self.cache.render('ice', (0, 0, 0))
+        self.cache.render('snow', (0, 0, 0))
+        self.cache.render('ice', (0, 0, 0))
+        self.cache.render('water', (0, 0, 0))
+        self.assertIs(self.cache.render('ice', (0, 0, 0)), ice)
+        self.assertEqual(len(self.cache.surfaces), 2)
+        self.assertNotIn(('snow', (0, 0, 0), None), self.cache.surfaces)
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import time
+import unittest as un
+
+import http_client as hc
+import server as sv
+import validate_numbers as vn
+from wiki_server import StandInWiki
+from word_generation import get_word_list
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WORDS = get_word_list(os.path.join(HERE, 'no_stop_g2.txt'))
+PLAYERS = 30
+
+
+def read_page(name):
+    with open(os.path.join(HERE, 'pages', name), 'rb') as f:
+        return f.read()
+
+
+class TestServer(un.TestCase):
+
+    def setUp(self):
+        pages = {'/wiki/germany': read_page('germany.html'),
+                 '/wiki/ice': read_page('ice.html'),
+                 '/wiki/glacier': read_page('glacier.html')}
+        self.wiki = StandInWiki(pages, delay=0.2).__enter__()
+        self.client = hc.HTTPClient()
+
+    def tearDown(self):
+        self.client.close()
+        self.wiki.__exit__()
+
+    def fetch(self, title, mode_choice=0):
+        """Fetch from the stand-in wiki"""
+        val = vn.Validation(title, client=self.client, tokenizer='fast', stream=True)
+        val.modes = [self.wiki.url + '/wiki/']
+        val.scrape_wiki(mode_choice)
+        val.process_wiki()
+        return val
+
+    async def player(self, port, seed, guesses):
+        """Start a game and make some guesses, returning the replies"""
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        replies = []
+        for request in [{'cmd': 'new', 'board_size': 5, 'limit': 7, 'seed': seed}] + guesses:
+            if replies:
+                request = dict(request, game=replies[0]['game'])
+            writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        return replies
+
+    async def play(self):
+        server = sv.GameServer(WORDS, fetch=self.fetch)
+        port = await server.start()
+        guesses = [{'cmd': 'guess', 'title': 'Germany'},
+                   {'cmd': 'guess', 'title': 'Ice | Glacier'}]
+        start = time.perf_counter()
+        games = await asyncio.gather(*[self.player(port, seed % 3, guesses)
+                                       for seed in range(PLAYERS)])
+        elapsed = time.perf_counter() - start
+        await server.close()
+        return server, games, elapsed
+
+    def test_single_flight(self):
+        """Test many players guessing at once share each fetch"""
+        server, games, elapsed = asyncio.run(self.play())
+        self.assertEqual(sorted(self.wiki.requests),
+                         ['/wiki/germany', '/wiki/glacier', '/wiki/ice'])
+        self.assertEqual(server.flights.started, 3)
+        self.assertEqual(server.flights.shared, 3 * PLAYERS - 3)
+        # Fetches overlap, so it's nowhere near 30 players * 3 articles * 0.2 s
+        self.assertLess(elapsed, 5)
+
+        for new, germany, batch in games:
+            self.assertEqual(germany['articles'][0]['title'], 'germany')
+            self.assertEqual([a['title'] for a in batch['articles']], ['ice', 'glacier'])
+            self.assertEqual(batch['state']['score'], 3)
+        # Games with the same seed play out the same
+        self.assertEqual(games[0][2]['state'], games[3][2]['state'])
+
+    def test_bad_requests(self):
+        """Test bad requests get an error instead of closing the connection"""
+        async def ask():
+            server = sv.GameServer(WORDS, fetch=self.fetch)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            replies = []
+            for line in [b'not json\n', b'{"cmd": "guess", "game": 99, "title": "x"}\n',
+                         b'{"cmd": "fly"}\n', b'{"cmd": "new", "board_size": "3"}\n',
+                         b'{"cmd": "new", "seed": 1.5}\n',
+                         b'{"cmd": "new", "board_size": 3}\n',
+                         b'{"cmd": "guess", "game": 1, "title": 5}\n',
+                         b'{"cmd": "guess", "game": 1, "title": "missing"}\n']:
+                writer.write(line)
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await server.close()
+            return replies
+
+        replies = asyncio.run(ask())
+        self.assertTrue(all('error' in reply for reply in replies[:5]))
+        self.assertEqual(len(replies[5]['state']['words']), 3)
+        self.assertIn('error', replies[6])
+        self.assertFalse(replies[7]['articles'][0]['found'])
+        self.assertEqual(replies[7]['state']['score'], 1)
+
+
+if __name__ == '__main__':
+    un.main()
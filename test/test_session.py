@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest as un
+
+import article_cache as ac
+import article_fetch as af
+import engine as en
+import session as ss
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WORDS = os.path.join(HERE, 'no_stop_g2.txt')
+
+
+def read_page(name):
+    with open(os.path.join(HERE, 'pages', name), 'rb') as f:
+        return f.read()
+
+
+class TestSession(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'game.session')
+        self.cache = ac.ArticleCache(os.path.join(self.directory, 'cache'))
+        self.cache.put(0, 'ice', read_page('ice.html'))
+        self.cache.put(0, 'glacier', read_page('glacier.html'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def play(self, titles):
+        """Play a game through the cache, recording it"""
+        recorder = ss.SessionRecorder(self.path)
+        cache = ss.RecordingCache(self.cache, recorder)
+        engine = en.BingoEngine(ss.get_word_list(WORDS), 3, 7, seed=42)
+        recorder.start_game(42, 3, 7, 0, 'html', WORDS)
+        for title in titles:
+            try:
+                result = af.FetchResult(title, af.fetch_article(title, 0, cache=cache,
+                                                                 client=ss.OfflineClient(),
+                                                                 tokenizer='fast', stream=True))
+            except IOError as err:
+                result = af.FetchResult(title, error=err)
+            engine.apply_counts(title, result.count_words(engine.board_index), result.found)
+            recorder.turn(title, engine)
+        recorder.close()
+        return engine
+
+    def test_replay(self):
+        """Test a recorded game plays back the same without the cache"""
+        engine = self.play(['ice', 'missing', 'glacier', 'ice'])
+        games, articles = ss.read_session(self.path)
+        self.assertEqual(len(games), 1)
+        self.assertEqual(len(games[0]['turns']), 4)
+        self.assertEqual(set(articles), {('0', 'ice'), ('0', 'glacier')})
+
+        timings = ss.replay(games, articles)
+        self.assertEqual([t['title'] for t in timings], ['ice', 'missing', 'glacier', 'ice'])
+        self.assertEqual(games[0]['turns'][-1]['state'], ss.board_state(engine))
+
+    def test_mismatch(self):
+        """Test a replay that comes out differently is reported"""
+        self.play(['ice', 'glacier'])
+        games, articles = ss.read_session(self.path)
+        del articles[('0', 'glacier')]
+        games[0]['turns'][1]['state']['score'] = 5
+        self.assertRaises(ValueError, ss.replay, games, articles)
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,75 @@
+import unittest as un
+
+import numpy as np
+
+import simulate as sm
+
+
+class Every:
+    """Articles with every word in them the same number of times"""
+
+    vocab_size = 100
+
+    def __init__(self, count):
+        self.count = count
+
+    def sample(self, word_ids, rng):
+        return np.full(word_ids.shape, self.count)
+
+
+class TestSimulate(un.TestCase):
+
+    def test_win_first_guess(self):
+        """Test games where every word is found are won straight away"""
+        guesses = sm.simulate_batch(50, 5, 5, Every(1), seed=0)
+        self.assertTrue((guesses == 1).all())
+
+    def test_overflow(self):
+        """Test games where every word overflows are never won"""
+        guesses = sm.simulate_batch(50, 3, 3, Every(3), seed=0, max_guesses=20)
+        self.assertTrue((guesses == 0).all())
+
+    def test_overflow_replacement(self):
+        """Test an overflowed word is never replaced by itself or another board word"""
+        class Recorded(Every):
+            vocab_size = 12
+
+            def __init__(self, count):
+                super().__init__(count)
+                self.boards = []
+
+            def sample(self, word_ids, rng):
+                self.boards.append(word_ids.copy())
+                return super().sample(word_ids, rng)
+
+        articles = Recorded(3)
+        sm.simulate_batch(50, 3, 3, articles, seed=0, max_guesses=30)
+        for before, after in zip(articles.boards, articles.boards[1:]):
+            self.assertFalse((before == after).any())
+            flat = np.sort(after.reshape(len(after), -1), axis=1)
+            self.assertFalse((flat[:, 1:] == flat[:, :-1]).any())
+
+    def test_unique_rows(self):
+        """Test no board has the same word twice"""
+        rng = np.random.default_rng(0)
+        ids = sm.unique_rows(rng.integers(0, 30, (200, 5, 5)), 30, rng)
+        for board in ids:
+            self.assertEqual(len(np.unique(board)), 25)
+
+    def test_repeatable(self):
+        """Test the same seed gives the same games, split over processes or not"""
+        articles = sm.ZipfArticles(2000)
+        one = sm.simulate(300, 3, 5, articles, seed=1, processes=1, batch_size=100)
+        two = sm.simulate(300, 3, 5, articles, seed=1, processes=2, batch_size=100)
+        np.testing.assert_array_equal(one, two)
+        self.assertTrue((one > 0).all())
+
+    def test_summary(self):
+        """Test scores follow the game's scoring"""
+        summary = sm.summarise(np.array([1, 1, 3, 0]), 5, 5)
+        self.assertEqual(summary['won'], 3)
+        self.assertEqual(summary['score'][50], 5000)
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import unittest as un
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHECK = '''
+import sys
+import {}
+print(','.join(m for m in ('pandas', 'bs4', 'nltk') if m in sys.modules))
+'''
+
+
+def loaded_modules(module):
+    """Import a module in a new python and list the heavy modules it loaded"""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    result = subprocess.run([sys.executable, '-c', CHECK.format(module)], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return result.stdout.decode().strip(), result.stderr.decode()
+
+
+class TestStartup(un.TestCase):
+
+    def test_game_import(self):
+        """Test starting the game doesn't load pandas, bs4 or nltk"""
+        loaded, _ = loaded_modules('game')
+        self.assertEqual(loaded, '')
+
+    def test_no_download(self):
+        """Test importing the article code doesn't download NLTK data"""
+        loaded, errors = loaded_modules('validate_numbers')
+        self.assertEqual(loaded, '')
+        self.assertNotIn('nltk_data', errors)
+
+
+if __name__ == '__main__':
+    un.main()
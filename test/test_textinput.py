@@ -0,0 +1,83 @@
+import unittest as un
+
+import pygame
+import pygame.locals as pl
+
+import pygame_textinput as pt
+
+
+class CountingFont:
+    """Count how often text is measured"""
+
+    def __init__(self, font):
+        self.font = font
+        self.sizes = 0
+
+    def render(self, *args):
+        return self.font.render(*args)
+
+    def size(self, text):
+        self.sizes += 1
+        return self.font.size(text)
+
+
+def type_key(key, unicode=''):
+    return [pygame.event.Event(pl.KEYDOWN, key=key, unicode=unicode),
+            pygame.event.Event(pl.KEYUP, key=key)]
+
+
+class TestTextInput(un.TestCase):
+
+    def setUp(self):
+        self.textinput = pt.TextInput('ice')
+        self.textinput.cursor_switch_ms = 10 ** 6
+        self.font = CountingFont(self.textinput.font_object)
+        self.textinput.font_object = self.font
+
+    def test_unchanged(self):
+        """Test nothing is rendered again when nothing has changed"""
+        self.textinput.update([])
+        surface = self.textinput.get_surface()
+        self.assertTrue(self.textinput.changed)
+        for _ in range(10):
+            self.textinput.update([])
+            self.assertFalse(self.textinput.changed)
+        self.assertIs(self.textinput.get_surface(), surface)
+        self.assertEqual(self.font.sizes, 1)
+
+    def test_typing(self):
+        """Test typing and moving the cursor render again"""
+        self.textinput.update([])
+        for events in [type_key(pl.K_s, 's'), type_key(pl.K_LEFT)]:
+            surface = self.textinput.get_surface()
+            self.textinput.update(events)
+            self.assertTrue(self.textinput.changed)
+            self.assertIsNot(self.textinput.get_surface(), surface)
+        self.assertEqual(self.textinput.get_text(), 'ices')
+        self.textinput.clear_text()
+        self.textinput.update([])
+        self.assertTrue(self.textinput.changed)
+
+    def test_blink(self):
+        """Test the cursor blinking renders again without measuring the text"""
+        self.textinput.update([])
+        for visible in [False, True, False]:
+            self.textinput.cursor_ms_counter = self.textinput.cursor_switch_ms
+            self.textinput.update([])
+            self.assertTrue(self.textinput.changed)
+            self.assertEqual(self.textinput.cursor_visible, visible)
+        self.assertEqual(self.font.sizes, 1)
+
+    def test_wait(self):
+        """Test the time until the cursor blinks or a held key repeats"""
+        self.textinput.cursor_switch_ms = 500
+        self.textinput.update([])
+        self.assertGreater(self.textinput.get_wait_ms(), 400)
+        self.textinput.update([pygame.event.Event(pl.KEYDOWN, key=pl.K_s, unicode='s')])
+        self.assertLessEqual(self.textinput.get_wait_ms(), self.textinput.keyrepeat_intial_interval_ms)
+        self.textinput.cursor_ms_counter = 499
+        self.assertLessEqual(self.textinput.get_wait_ms(), 1)
+
+
+if __name__ == '__main__':
+    un.main()
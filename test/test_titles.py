@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest as un
+
+import article_cache as ac
+import http_client as hc
+import titles as tt
+import validate_numbers as vn
+from wiki_server import StandInWiki
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(HERE, 'pages', 'ice.html'), 'rb') as f:
+    PAGE = f.read()
+
+
+class TestTitles(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.titles = tt.TitleIndex(os.path.join(self.directory, 'titles.db'))
+        self.cache = ac.ArticleCache(os.path.join(self.directory, 'cache'))
+        # Frozen water is a redirect, served as the Ice page like Wikipedia does
+        self.wiki = StandInWiki({'/wiki/Ice': PAGE, '/wiki/frozen_water': PAGE},
+                                redirects={'/wiki/ice': '/wiki/Ice'}).__enter__()
+        self.client = hc.HTTPClient()
+
+    def tearDown(self):
+        self.client.close()
+        self.wiki.__exit__()
+        shutil.rmtree(self.directory)
+
+    def fetch(self, title, stream=True):
+        val = vn.Validation(title, cache=self.cache, client=self.client, tokenizer='fast',
+                            stream=stream, titles=self.titles)
+        val.modes = [self.wiki.url + '/wiki/']
+        val.scrape_wiki()
+        val.process_wiki()
+        return val
+
+    def test_title_from_url(self):
+        """Test getting titles from canonical links"""
+        self.assertEqual(tt.title_from_url('https://en.wikipedia.org/wiki/Caf%C3%A9'), 'Café')
+        self.assertIsNone(tt.title_from_url('https://en.wikipedia.org/w/index.php'))
+
+    def test_redirects(self):
+        """Test every spelling of a redirect ends up at the same cached article"""
+        for stream in [True, False]:
+            self.titles = tt.TitleIndex(os.path.join(self.directory, '{}.db'.format(stream)))
+            self.cache = ac.ArticleCache(os.path.join(self.directory, str(stream)))
+            first = self.fetch('frozen water', stream)
+            self.assertEqual(first.title, 'Ice')
+            self.assertEqual(self.titles.resolve(0, 'Frozen_Water'), 'Ice')
+            requests = len(self.wiki.requests)
+            for title in ['Frozen Water', 'FROZEN_WATER', 'ice', 'Ice']:
+                self.assertEqual(self.fetch(title, stream).token, first.token)
+            self.assertEqual(len(self.wiki.requests), requests)
+
+    def test_missing(self):
+        """Test titles that weren't found fail without asking again until they expire"""
+        for _ in range(3):
+            with self.assertRaises(hc.HTTPError):
+                self.fetch('not an article')
+        self.assertEqual(self.wiki.requests, ['/wiki/not_an_article'])
+
+        self.titles.missing_ttl = -1
+        self.titles.add_missing(0, 'not an article')
+        with self.assertRaises(hc.HTTPError):
+            self.fetch('not an article')
+        self.assertEqual(len(self.wiki.requests), 2)
+
+
+if __name__ == '__main__':
+    un.main()
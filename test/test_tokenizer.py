@@ -0,0 +1,67 @@
+import os
+import re
+import unittest as un
+
+import nltk
+from bs4 import BeautifulSoup as bs
+from nltk.tokenize import NLTKWordTokenizer
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+import tokenizer as tk
+import validate_numbers as vn
+import word_generation as wn
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PAGES = ['ice', 'glacier', 'germany']
+
+
+def nltk_tokenize(text):
+    """Tokenise with NLTK, using an untrained Punkt model if needed"""
+    try:
+        return nltk.word_tokenize(text)
+    except LookupError:
+        sentences = PunktSentenceTokenizer().tokenize(text)
+        words = NLTKWordTokenizer()
+        return [token for sent in sentences for token in words.tokenize(sent)]
+
+
+def page_text(name):
+    with open(os.path.join(HERE, 'pages', name + '.html'), 'rb') as f:
+        text = bs(f.read(), 'html.parser').get_text()
+    return re.sub(r'\[(\d+)\]', '', text.replace('[edit]', ''))
+
+
+class TestTokenizer(un.TestCase):
+
+    def test_words(self):
+        """Test splitting of punctuation and clitics"""
+        tokens = tk.word_tokenize("Don't stop. The players' 1,000 e-mails... (cannot) skater's")
+        self.assertEqual(tokens, ['do', "n't", 'stop', 'the', 'players', '1,000',
+                                  'e-mails', 'can', 'not', 'skater', "'s"])
+
+    def test_full_stops(self):
+        """Test only sentence-final full stops are split"""
+        self.assertEqual(tk.word_tokenize('See U.S. maps. Done.'),
+                         ['see', 'u.s', 'maps', 'done'])
+        self.assertEqual(tk.word_tokenize('Stop.” Go.)'), ['stop', 'go'])
+
+    def test_parity(self):
+        """Test the board words match NLTK on saved pages"""
+        vocab = set(wn.get_word_list(os.path.join(HERE, 'no_stop_g2.txt')))
+        for name in PAGES:
+            text = page_text(name)
+            expected = [t.lower() for t in nltk_tokenize(text) if t.lower() in vocab]
+            tokens = [t for t in tk.word_tokenize(text) if t in vocab]
+            self.assertEqual(tokens, expected, name)
+            self.assertGreater(len(tokens), 50)
+
+    def test_validation(self):
+        """Test the fast tokenizer can be selected on Validation"""
+        val = vn.Validation('Ice', tokenizer='fast')
+        val.page_text = 'Ice is frozen water.[1] Physical properties[edit]'
+        val.process_wiki()
+        self.assertEqual(val.token, ['ice', 'is', 'frozen', 'water', 'physical', 'properties'])
+
+
+if __name__ == '__main__':
+    un.main()
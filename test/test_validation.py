@@ -1,21 +1,45 @@
+import os
 import unittest as un
-import word_generation as wn
-import numpy as np
+
+import http_client as hc
 import validate_numbers as vn
+from wiki_server import StandInWiki
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(HERE, 'pages', 'ice.html'), 'rb') as f:
+    PAGE = f.read()
+
 
 class TestValidation(un.TestCase):
 
+    def setUp(self):
+        self.wiki = StandInWiki({'/wiki/Ice': PAGE}).__enter__()
+        self.client = hc.HTTPClient()
+
+    def tearDown(self):
+        self.client.close()
+        self.wiki.__exit__()
+
+    def validation(self):
+        val = vn.Validation('Ice', client=self.client, tokenizer='fast')
+        val.modes = [self.wiki.url + '/wiki/']
+        return val
+
     def test_scrape_wiki(self):
         """Test getting page title"""
-        val = vn.Validation('Ice', 'ice', np.arange(0,20))
+        val = self.validation()
         val.scrape_wiki()
+        self.assertIn('Ice', val.page_text)
 
     def test_process_wiki(self):
         """Test removing wiki markup"""
-        val = vn.Validation('Ice', 'ice', np.arange(0,20))
+        val = self.validation()
         val.scrape_wiki()
         val.process_wiki()
+        self.assertNotIn('[edit]', val.stripped_text)
+        self.assertIn('ice', val.token)
 
 
 if __name__ == '__main__':
-    un.main()
\ No newline at end of file
+    un.main()
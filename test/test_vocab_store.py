@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+import unittest as un
+
+import numpy as np
+
+import board as bd
+import validate_numbers as vn
+import vocab_store as vs
+
+WORDS = ['ice', 'snow', 'water', 'cold', 'river', '']
+
+
+class TestVocabStore(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        words = np.array([['ice', 'snow'], ['water', 'hot']], dtype=object)
+        self.index = bd.BoardIndex(words)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_counts_match_tokens(self):
+        """Test stored counts give the same result as counting tokens"""
+        store = vs.VocabStore(self.directory, WORDS)
+        tokens = ['Water', 'is', 'cold', 'ice', 'water', 'snow', 'ICE', 'water']
+        store.add('0:ice', tokens)
+        counts = store.board_counts(store.vector('0:ice'), self.index)
+        self.assertEqual(list(counts.items()), list(bd.count_board_words(tokens, self.index).items()))
+
+    def test_persistence(self):
+        """Test a new store reads what an earlier one wrote"""
+        store = vs.VocabStore(self.directory, WORDS)
+        store.add('0:a', ['ice'])
+        store.add('0:b', ['nothing'])
+        store.add('0:c', ['snow', 'snow', 'river'])
+        store = vs.VocabStore(self.directory, WORDS)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(dict(store.board_counts(store.vector('0:c'), self.index)), {'snow': 2})
+        self.assertEqual(len(store.vector('0:b')[0]), 0)
+
+    def test_interrupted_add(self):
+        """Test data left by an add that didn't finish doesn't shift later articles"""
+        store = vs.VocabStore(self.directory, WORDS)
+        store.add('0:a', ['ice', 'water'])
+        with open(store.ids_path, 'ab') as f:
+            f.write(np.array([1, 2, 3], dtype=vs.ID_TYPE).tobytes())
+        with open(store.counts_path, 'ab') as f:
+            f.write(np.array([7], dtype=vs.COUNT_TYPE).tobytes() + b'\x01')
+        # Stopped part way through writing the counts, before the index.
+
+        store = vs.VocabStore(self.directory, WORDS)
+        store.add('0:b', ['snow', 'snow', 'river'])
+        store = vs.VocabStore(self.directory, WORDS)
+        self.assertEqual(dict(store.board_counts(store.vector('0:a'), self.index)),
+                         {'ice': 1, 'water': 1})
+        self.assertEqual(dict(store.board_counts(store.vector('0:b'), self.index)), {'snow': 2})
+        self.assertEqual(len(store.vector('0:b')[0]), 2)
+
+    def test_validation_skips_fetch(self):
+        """Test a repeat guess is counted from the store"""
+        store = vs.VocabStore(self.directory, WORDS)
+        val = vn.Validation('Ice', tokenizer='fast', store=store)
+        val.download = lambda mode_choice: b'<p>Ice and snow and ice.</p>'
+        val.scrape_wiki()
+        val.process_wiki()
+        self.assertIn('0:ice', store)
+
+        val = vn.Validation('ice', tokenizer='fast', store=store)
+        val.download = None
+        val.scrape_wiki()
+        val.process_wiki()
+        self.assertIsNone(val.token)
+        self.assertEqual(list(val.count_words(self.index).items()), [('ice', 2), ('snow', 1)])
+
+
+if __name__ == '__main__':
+    un.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest as un
+
+import validate_numbers as vn
+import wiki_dump as wd
+
+
+def synthetic_pages(n):
+    pages = [('Page {}'.format(i), 'Text of page {} with [[ice]] & snow.'.format(i))
+             for i in range(n)]
+    pages.append(('Ice', "'''Ice''' is frozen [[water]]."))
+    pages.append(('ICE', 'The InterCity Express train.'))
+    pages.append(('Frozen water', '#REDIRECT [[Ice]]'))
+    return pages
+
+
+class TestWikiDump(un.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test-pages-articles-multistream.xml.bz2')
+        wd.write_dump(self.path, synthetic_pages(250), pages_per_stream=50)
+        self.dump = wd.WikiDump(self.path)
+
+    def tearDown(self):
+        self.dump.close()
+        shutil.rmtree(self.directory)
+
+    def test_index(self):
+        """Test every page is indexed in sorted order"""
+        self.assertEqual(self.dump.count, 253)
+        keys = [self.dump.record(i)[0] for i in range(self.dump.count)]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_get_page(self):
+        """Test pages are found by title in any stream"""
+        self.assertEqual(self.dump.get_page('Page 0'), 'Text of page 0 with [[ice]] & snow.')
+        self.assertEqual(self.dump.get_page('page_249'), 'Text of page 249 with [[ice]] & snow.')
+        with self.assertRaises(KeyError):
+            self.dump.get_page('Nothing')
+
+    def test_case_and_redirects(self):
+        """Test exact case wins and redirects are followed"""
+        self.assertEqual(self.dump.get_page('ice'), "'''Ice''' is frozen [[water]].")
+        self.assertEqual(self.dump.get_page('ICE'), 'The InterCity Express train.')
+        self.assertEqual(self.dump.get_page('frozen water'), "'''Ice''' is frozen [[water]].")
+
+    def test_validation(self):
+        """Test Validation reads from the dump"""
+        val = vn.Validation('frozen water', tokenizer='fast', dump=self.dump)
+        val.client = None
+        val.scrape_wiki()
+        val.process_wiki()
+        self.assertEqual(val.token, ['ice', 'is', 'frozen', 'water'])
+
+
+if __name__ == '__main__':
+    un.main()
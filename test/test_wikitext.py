@@ -0,0 +1,58 @@
+import os
+import unittest as un
+
+import validate_numbers as vn
+import wikitext as wt
+from http_client import HTTPClient
+from wiki_server import StandInWiki
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_page(name):
+    with open(os.path.join(HERE, 'pages', name), 'rb') as f:
+        return f.read()
+
+
+class TestWikitext(un.TestCase):
+
+    def test_links(self):
+        """Test links are replaced by their text"""
+        text = wt.clean_wikitext("'''Ice''' is [[water]] that is [[Freezing|frozen]].")
+        self.assertEqual(text, 'Ice is water that is frozen.')
+
+    def test_removed_markup(self):
+        """Test templates, references, files and categories are removed"""
+        source = ('{{Infobox|name={{lang|de|Eis}}}}Cold<ref name="a">{{cite|x}}</ref>'
+                  ' [[File:Ice.jpg|thumb|An [[iceberg]]]]water<!-- note -->\n'
+                  '[[Category:Ice]]')
+        self.assertEqual(wt.clean_wikitext(source).split(), ['Cold', 'water'])
+
+    def test_tables_and_headings(self):
+        """Test table cells and headings keep their text"""
+        source = '== Uses ==\n{|\n|-\n! Name !! Use\n|-\n| style="x" | Skating || Fun\n|}'
+        self.assertEqual(wt.clean_wikitext(source).split(), ['Uses', 'Name', 'Use', 'Skating', 'Fun'])
+
+    def test_redirect(self):
+        """Test redirect targets are found"""
+        self.assertEqual(wt.redirect_target('#REDIRECT [[Ice#Uses]]'), 'Ice')
+        self.assertIsNone(wt.redirect_target('Ice is cold.'))
+
+    def test_raw_mode(self):
+        """Test Validation fetches and cleans the article source"""
+        pages = {'/w/index.php?action=raw&title=Ice': read_page('ice.wiki'),
+                 '/w/index.php?action=raw&title=ICE': b'#REDIRECT [[Ice]]'}
+        with StandInWiki(pages) as wiki:
+            client = HTTPClient()
+            val = vn.Validation('ICE', client=client, tokenizer='fast', source='raw')
+            val.raw_modes = [wiki.url + '/w/index.php?action=raw&title=']
+            val.scrape_wiki()
+            val.process_wiki()
+            client.close()
+        self.assertEqual(val.title, 'Ice')
+        self.assertEqual(val.token[:4], ['ice', 'is', 'water', 'that'])
+        self.assertNotIn('cite', val.token)
+
+
+if __name__ == '__main__':
+    un.main()
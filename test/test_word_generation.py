@@ -9,20 +9,27 @@ class TestGeneration(un.TestCase):
         self.assertEqual(len(w), 9368)
         self.assertTrue('germany' in w)
 
-    def test_word_generate(self):
-        """Test word generation with loaded file"""
-        w = wn.get_word_list('no_stop_g2.txt')
-        word = wn.TargetWord(w)
-        word.word_gen()
-        print(word.word)
+    def test_pool(self):
+        """Test drawing without replacement and putting words back"""
+        pool = wn.WordPool(['Ice', 'snow', 'ice', 'water', ''], seed=0)
+        self.assertEqual(len(pool), 3)
+        drawn = {pool.draw() for _ in range(3)}
+        self.assertEqual(drawn, {'ice', 'snow', 'water'})
+        self.assertEqual(len(pool), 0)
+        pool.put_back('snow')
+        pool.put_back('snow')
+        self.assertIn('snow', pool)
+        self.assertNotIn('ice', pool)
+        self.assertEqual(pool.draw(), 'snow')
+        self.assertRaises(ValueError, pool.draw)
 
-    def test_range_generate(self):
-        """Test range generation"""
+    def test_pool_seed(self):
+        """Test the same seed draws the same words"""
         w = wn.get_word_list('no_stop_g2.txt')
-        word = wn.TargetWord(w)
-        word.word_gen()
-        word.range_gen()
-        print(word.range)
+        first = wn.WordPool(w, seed=5)
+        second = wn.WordPool(w, seed=5)
+        self.assertEqual([first.draw() for _ in range(49)], [second.draw() for _ in range(49)])
+
 
 if __name__ == '__main__':
     un.main()
\ No newline at end of file
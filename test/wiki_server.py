@@ -0,0 +1,80 @@
+"""A local stand-in for Wikipedia used by the tests."""
+
+import gzip
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class WikiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        wiki = self.server.wiki
+        with wiki.lock:
+            wiki.requests.append(self.path)
+            wiki.clients.add(self.client_address)
+
+        path = unquote(self.path)
+        if path in wiki.redirects:
+            self.send_response(301)
+            self.send_header('Location', wiki.redirects[path])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = wiki.pages.get(path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if wiki.delay:
+            wiki.delay_event.wait(wiki.delay)
+        self.send_response(200)
+        if wiki.gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInWiki:
+    """Serve a dictionary of path -> page bytes on localhost."""
+
+    def __init__(self, pages=None, redirects=None, gzip=True, delay=0):
+        self.pages = dict(pages or {})
+        self.redirects = dict(redirects or {})
+        self.gzip = gzip
+        self.delay = delay
+        self.delay_event = threading.Event()
+        self.requests = []
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), WikiHandler)
+        self.server.daemon_threads = True
+        self.server.wiki = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.delay_event.set()
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,105 @@
+"""Remember which article each guess led to, and which guesses aren't articles."""
+
+import sqlite3
+import time
+from urllib.parse import unquote, urlsplit
+
+from article_cache import normalise_title
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS titles (
+    mode TEXT NOT NULL,
+    title TEXT NOT NULL,
+    canonical TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (mode, title)
+);
+CREATE TABLE IF NOT EXISTS missing (
+    mode TEXT NOT NULL,
+    title TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (mode, title)
+);
+'''
+
+
+def title_from_url(url):
+    """Get the article title from a /wiki/ address, or None"""
+    path = urlsplit(url).path
+    if '/wiki/' not in path:
+        return None
+    return unquote(path.split('/wiki/', 1)[1]) or None
+
+
+class TitleIndex:
+    """
+    A persistent map from guessed titles to the articles they lead to.
+
+    Wikipedia answers "frozen water" with the Ice article, so once that's
+    been seen the guess is fetched, cached and stored as Ice from then on
+    and any spelling of it finds the same cached page. Titles that weren't
+    found are remembered for missing_ttl seconds so guessing them again
+    fails straight away instead of asking Wikipedia again.
+
+    Titles are kept per wiki mode, normalised as in the ArticleCache. Like
+    the leaderboard it's an SQLite file, so games can share it.
+    """
+
+    def __init__(self, path='titles.db', missing_ttl=24 * 3600, timeout=10):
+        """Initialise the parameters"""
+        self.path = path
+        self.missing_ttl = missing_ttl
+        self.timeout = timeout
+        db = self.connect()
+        try:
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+    def connect(self):
+        """Open a connection to the database"""
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    def resolve(self, mode, title):
+        """Return the article a title led to before, or the title itself"""
+        db = self.connect()
+        try:
+            row = db.execute('SELECT canonical FROM titles WHERE mode = ? AND title = ?',
+                             (str(mode), normalise_title(title))).fetchone()
+        finally:
+            db.close()
+        return row[0] if row is not None else title
+
+    def add(self, mode, title, canonical):
+        """Remember that a title led to an article"""
+        if normalise_title(title) == normalise_title(canonical):
+            return
+            # Only a different spelling, the cache already treats them the same.
+        db = self.connect()
+        try:
+            with db:
+                db.execute('INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?)',
+                           (str(mode), normalise_title(title), canonical, time.time()))
+        finally:
+            db.close()
+
+    def is_missing(self, mode, title):
+        """True if the title wasn't found recently"""
+        db = self.connect()
+        try:
+            row = db.execute('SELECT expires FROM missing WHERE mode = ? AND title = ?',
+                             (str(mode), normalise_title(title))).fetchone()
+        finally:
+            db.close()
+        return row is not None and row[0] > time.time()
+
+    def add_missing(self, mode, title):
+        """Remember that a title wasn't found"""
+        db = self.connect()
+        try:
+            with db:
+                db.execute('INSERT OR REPLACE INTO missing VALUES (?, ?, ?)',
+                           (str(mode), normalise_title(title), time.time() + self.missing_ttl))
+        finally:
+            db.close()
@@ -0,0 +1,69 @@
+"""
+A fast single-pass word tokenizer.
+
+This gives the same lowercase words as nltk.word_tokenize for everything
+that could be on a Bingo board (plain alphabetic words), but uses one
+compiled regular expression instead of NLTK's sentence splitter and
+dozens of substitution passes. Punctuation tokens are dropped.
+"""
+
+import re
+
+
+CHUNK = re.compile(r"""
+    (?:
+        [^\s;@#$%&?!*()\[\]{}<>"`«“‘„»”’‒-―,:.\-]
+      | [,:](?=\d)                  # 1,000 and 10:30 stay together
+      | (?<!\.)\.(?!\.)             # ... is split off
+        (?![\]\)}>"'»”’]*(?:\s|$))  # and so is a full stop
+      | (?<!-)-(?!-)                # and --
+    )+
+""", re.VERBOSE)
+# Runs of characters that NLTK never splits apart.
+
+LEADING_QUOTE = re.compile(r"'(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w)")
+
+CLITICS = ("n't", "'ll", "'re", "'ve", "'s", "'m", "'d")
+
+CONTRACTIONS = {'cannot': ['can', 'not'],
+                'gimme': ['gim', 'me'],
+                'gonna': ['gon', 'na'],
+                'gotta': ['got', 'ta'],
+                'lemme': ['lem', 'me'],
+                'wanna': ['wan', 'na'],
+                "d'ye": ['d', "'ye"],
+                "more'n": ['more', "'n"]}
+# Words NLTK always splits in two.
+
+
+def split_chunk(chunk):
+    """Split the quotes and clitics NLTK separates from a chunk"""
+    if LEADING_QUOTE.match(chunk):
+        chunk = chunk[1:]
+    if chunk in CONTRACTIONS:
+        return CONTRACTIONS[chunk]
+
+    for clitic in CLITICS:
+        if chunk.endswith(clitic) and len(chunk) > len(clitic):
+            if chunk[-len(clitic) - 1] != "'":
+                return [chunk[:-len(clitic)], clitic]
+            break
+    else:
+        if chunk.endswith("'") and len(chunk) > 1 and chunk[-2] != "'":
+            return [chunk[:-1]]
+            # Trailing quote.
+
+    return [chunk] if chunk != "'" else []
+
+
+def word_tokenize(text):
+    """Split text into lowercase tokens"""
+    tokens = []
+    append = tokens.append
+    extend = tokens.extend
+    for chunk in CHUNK.findall(text.lower()):
+        if "'" in chunk or chunk in CONTRACTIONS:
+            extend(split_chunk(chunk))
+        else:
+            append(chunk)
+    return tokens
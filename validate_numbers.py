@@ -1,21 +1,86 @@
-import urllib.request as un
-from bs4 import BeautifulSoup as bs
+from urllib.parse import quote
 import re
-import nltk
+import time
+import warnings
+import zlib
+
+from article_cache import LEVEL
+from board import count_board_words
+from html_stream import StreamingExtractor, iter_chunks
+from http_client import HTTPClient, HTTPError
+from titles import title_from_url
+import tokenizer
+import wikitext
+
+MODES = ['https://en.wikipedia.org/wiki/',
+         'https://simple.wikipedia.org/wiki/']
+# Simple english and normal mode.
+
+RAW_MODES = ['https://en.wikipedia.org/w/index.php?action=raw&title=',
+             'https://simple.wikipedia.org/w/index.php?action=raw&title=']
+# The same wikis, but fetching the article source instead of the page.
+
+CLIENT = HTTPClient()
+# Shared by every Validation so connections are reused between guesses.
+
+PUNKT_FOUND = None
+# Whether NLTK's punkt data is installed, checked the first time it's needed.
+
+
+def nltk_tokenize(text):
+    """Tokenise with NLTK, or the fast tokenizer if punkt isn't installed"""
+    global PUNKT_FOUND
+    import nltk
+    # Slow to import, so only done when NLTK is actually used.
+
+    if PUNKT_FOUND is None:
+        try:
+            nltk.word_tokenize('Check.')
+            PUNKT_FOUND = True
+        except LookupError:
+            PUNKT_FOUND = False
+            warnings.warn("NLTK punkt data isn't installed (python -m nltk.downloader punkt_tab), "
+                          "using the built in tokenizer instead")
+        # Only looks on this machine, never downloads.
+
+    if not PUNKT_FOUND:
+        return tokenizer.word_tokenize(text)
+    return nltk.word_tokenize(text)
 
-# Download NLTK package
-nltk.download('punkt')
 
 class Validation:
     """Validate word lengths"""
 
-    def __init__(self, page_title):
+    def __init__(self, page_title, cache=None, client=None, tokenizer='nltk',
+                 stream=False, source='html', dump=None, store=None, span=None, titles=None):
         """Initialise the parameters"""
+        self.page_data = None
         self.page_text = None
         self.stripped_text = None
         self.title = page_title
         self.raw_title = page_title
         self.token = None
+        self.cache = cache
+        self.modes = MODES
+        self.raw_modes = RAW_MODES
+        self.client = client if client is not None else CLIENT
+        self.tokenizer = tokenizer
+        # 'nltk' or 'fast'.
+        self.stream = stream
+        # Tokenise the html as it arrives instead of parsing it all at once.
+        self.source = source
+        # 'html' for the rendered page or 'raw' for the wikitext source.
+        self.dump = dump
+        # An offline WikiDump to read articles from instead of the network.
+        self.store = store
+        self.vector = None
+        # Word counts from a VocabStore, used instead of tokens on a repeat.
+        self.span = span
+        # A metrics.Span to time each stage in, or None to not time anything.
+        self.titles = titles
+        # A TitleIndex of where guesses led before and which weren't found.
+        self.canonical = None
+        # The title the page says it has, e.g. Ice when asking for frozen water.
 
     def scrape_wiki(self, mode_choice=0):
         """Get text from Wikipedia page"""
@@ -23,20 +88,167 @@ class Validation:
         self.title = self.title.replace(' ', '_')
         # Add underscore for page search.
 
-        modes = ['https://en.wikipedia.org/wiki/',
-                 'https://simple.wikipedia.org/wiki/']
-        # Simple english and normal mode.
+        guess = self.title
+        if self.titles is not None:
+            self.title = self.titles.resolve(self.cache_mode(mode_choice), self.title)
+            # Go straight to the article this led to last time.
+
+        if self.store is not None:
+            start = time.perf_counter()
+            self.store_key = self.store.make_key(self.cache_mode(mode_choice), self.title)
+            if self.store_key in self.store:
+                self.vector = self.store.vector(self.store_key)
+                self.timed('store', start)
+                return
+                # Counted before, no need to fetch it again.
+
+        if self.dump is not None:
+            start = time.perf_counter()
+            self.source = 'raw'
+            self.page_data = self.dump.get_page(self.title).encode('utf-8')
+            self.timed('dump', start)
+            self.parse_page(self.page_data)
+            return
+
+        key = self.title
+        data = None
+        if self.cache is not None:
+            start = time.perf_counter()
+            data = self.cache.get(self.cache_mode(mode_choice), key)
+            # Use a previously downloaded copy if there is one.
+            self.timed('cache', start)
+
+        if data is None and self.titles is not None:
+            if self.titles.is_missing(self.cache_mode(mode_choice), self.title):
+                raise HTTPError(self.page_url(mode_choice), 404)
+                # Not found last time, don't ask again yet.
+
+        try:
+            if self.stream and self.source == 'html':
+                self.stream_page(mode_choice, data, guess)
+                return
+
+            downloaded = data is None
+            if downloaded:
+                data = self.download(mode_choice)
+        except HTTPError as err:
+            if err.status == 404 and self.titles is not None:
+                self.titles.add_missing(self.cache_mode(mode_choice), guess)
+            raise
+
+        self.page_data = data
+        self.parse_page(data)
+        if self.titles is not None:
+            key = self.learn(mode_choice, guess)
+        if downloaded and self.cache is not None:
+            self.cache.put(self.cache_mode(mode_choice), key, data)
+
+    def learn(self, mode_choice, guess):
+        """Remember the article a guess led to, returning its title"""
+        if self.canonical:
+            self.title = self.canonical
+            # Raw pages have no canonical link, but have followed their redirects already.
+        self.titles.add(self.cache_mode(mode_choice), guess, self.title)
+        return self.title
 
-        url = modes[mode_choice]+self.title
-        web_data = un.urlopen(url)
-        read_page = bs(web_data.read(), 'html.parser')
+    def cache_mode(self, mode_choice=0):
+        """Get the mode the page is cached under"""
+        if self.source == 'raw':
+            return 'raw{}'.format(mode_choice)
+        return mode_choice
+
+    def page_url(self, mode_choice=0):
+        """Get the address of the Wikipedia page"""
+        if self.source == 'raw':
+            return self.raw_modes[mode_choice]+quote(self.title)
+        return self.modes[mode_choice]+quote(self.title)
+
+    def download(self, mode_choice=0, max_redirects=3):
+        """Download the raw html (or wikitext) of the Wikipedia page"""
+        data = self.client.get(self.page_url(mode_choice), span=self.span)
+        if self.source == 'raw' and max_redirects > 0:
+            target = wikitext.redirect_target(data.decode('utf-8', 'replace'))
+            if target:
+                self.title = target.replace(' ', '_')
+                return self.download(mode_choice, max_redirects - 1)
+                # Raw pages don't follow redirects themselves.
+        return data
+
+    def stream_page(self, mode_choice=0, data=None, guess=None):
+        """Tokenise the page html while it downloads"""
+        if data is not None:
+            chunks = iter_chunks(data)
+            saved = None
+        else:
+            chunks = self.client.stream(self.page_url(mode_choice), span=self.span)
+            saved = None
+            if self.cache is not None:
+                compressor = zlib.compressobj(LEVEL)
+                saved = []
+                # The page is compressed as it arrives, and only kept to fill the cache.
+
+        extractor = StreamingExtractor(self.tokenize)
+        tokenizing = self.span.stages.get('tokenize', 0) if self.span is not None else 0
+        parsing = 0
+        for chunk in chunks:
+            if saved is not None:
+                saved.append(compressor.compress(chunk))
+            start = time.perf_counter()
+            extractor.feed_bytes(chunk)
+            parsing += time.perf_counter() - start
+        start = time.perf_counter()
+        self.token = extractor.close()
+        parsing += time.perf_counter() - start
+
+        if self.span is not None:
+            tokenizing = self.span.stages.get('tokenize', 0) - tokenizing
+            self.span.add('parse', parsing - tokenizing)
+            # The tokenizer runs inside the parser, but is timed on its own.
+            self.span.count('bytes', extractor.bytes_in)
+            self.span.count('tokens', len(self.token))
+        self.remember()
+
+        if extractor.canonical is not None:
+            self.canonical = title_from_url(extractor.canonical)
+        if self.titles is not None:
+            self.learn(mode_choice, guess if guess is not None else self.title)
+
+        if saved is not None:
+            saved.append(compressor.flush())
+            self.cache.put_compressed(mode_choice, self.title, b''.join(saved))
+
+    def parse_page(self, data):
+        """Get the text from page html"""
+        start = time.perf_counter()
+        if self.span is not None:
+            self.span.count('bytes', len(data))
+
+        if self.source == 'raw':
+            self.page_text = wikitext.clean_wikitext(data.decode('utf-8', 'replace'))
+            self.timed('parse', start)
+            return
+
+        from bs4 import BeautifulSoup as bs
+        # Slow to import, and not needed when streaming or reading wikitext.
+
+        read_page = bs(data, 'html.parser')
         text = read_page.get_text()
         # Get parsed text in html.
 
+        link = read_page.find('link', rel='canonical')
+        if link is not None and link.get('href'):
+            self.canonical = title_from_url(link['href'])
+
         self.page_text = text
+        self.timed('parse', start)
 
     def process_wiki(self):
         """Process wiki text to tokenise words"""
+        if self.vector is not None or (self.stream and self.source == 'html'):
+            return
+            # Already counted or tokenised while streaming.
+
+        start = time.perf_counter()
         stripped = self.page_text.replace('[edit]', '')
         # Get rid of random [edit].
 
@@ -44,7 +256,41 @@ class Validation:
         # Get rid of reference numbers.
 
         self.stripped_text = stripped
-        tokens = nltk.word_tokenize(self.stripped_text)
+        self.timed('clean', start)
+        tokens = self.tokenize(self.stripped_text)
         self.token = tokens
+        if self.span is not None:
+            self.span.count('tokens', len(tokens))
+        self.remember()
+
+    def remember(self):
+        """Save the word counts of the page for next time"""
+        if self.store is not None:
+            self.store.add(self.store_key, self.token)
+
+    def count_words(self, index):
+        """Count the words of the page that are on the board"""
+        start = time.perf_counter()
+        if self.vector is not None:
+            counter = self.store.board_counts(self.vector, index)
+        else:
+            counter = count_board_words(self.token, index)
+        self.timed('match', start)
+        return counter
+
+    def tokenize(self, text):
+        """Split text into words with the chosen tokenizer"""
+        start = time.perf_counter()
+        if self.tokenizer == 'fast':
+            tokens = tokenizer.word_tokenize(text)
+        else:
+            tokens = nltk_tokenize(text)
+        self.timed('tokenize', start)
+        return tokens
+
+    def timed(self, stage, start):
+        """Add the time since start to a stage of the span, if there is one"""
+        if self.span is not None:
+            self.span.add(stage, time.perf_counter() - start)
 
 
@@ -0,0 +1,123 @@
+"""Store how often each game word appears in the articles already played."""
+
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+from article_cache import normalise_title
+
+
+ID_TYPE = np.uint16
+COUNT_TYPE = np.uint32
+
+
+class VocabStore:
+    """
+    Sparse per-article counts of the words that can be on a board.
+
+    Each article is a run of word ids and a run of counts, appended to two
+    memory-mapped arrays. Ids are kept in the order the words first appear
+    in the article, so the game lists them exactly as it would after
+    counting the tokens. A text index maps article keys to their runs.
+    """
+
+    def __init__(self, directory, words):
+        """Initialise the parameters"""
+        self.directory = directory
+        self.words = [word for word in words if word]
+        self.word_ids = {word: i for i, word in enumerate(self.words)}
+        if len(self.words) > np.iinfo(ID_TYPE).max:
+            raise ValueError('Too many words for {} ids'.format(ID_TYPE.__name__))
+
+        os.makedirs(directory, exist_ok=True)
+        self.ids_path = os.path.join(directory, 'ids.bin')
+        self.counts_path = os.path.join(directory, 'counts.bin')
+        self.index_path = os.path.join(directory, 'index.txt')
+        self.lock = threading.Lock()
+        self.index = {}
+        self.ids = None
+        self.counts = None
+        self.load_index()
+
+    def load_index(self):
+        """Read the article index, leaving out runs the data files don't hold"""
+        if not os.path.exists(self.index_path):
+            return
+        size = self.data_size()
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                key, start, length = line.rstrip('\n').rsplit('\t', 2)
+                if int(start) + int(length) <= size:
+                    self.index[key] = (int(start), int(length))
+
+    def data_size(self):
+        """
+        The number of ids and counts stored, where the next article starts.
+
+        If an add was stopped part way the ids and counts files can differ in
+        length or end in part of a number. Both are cut back to the entries
+        they share, which no article in the index uses yet.
+        """
+        files = [(self.ids_path, np.dtype(ID_TYPE).itemsize),
+                 (self.counts_path, np.dtype(COUNT_TYPE).itemsize)]
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path, _ in files]
+        size = min(length // itemsize for length, (_, itemsize) in zip(sizes, files))
+        for length, (path, itemsize) in zip(sizes, files):
+            if length != size * itemsize:
+                with open(path, 'r+b') as f:
+                    f.truncate(size * itemsize)
+                self.ids = self.counts = None
+                # Remapped when it's next read.
+        return size
+
+    @staticmethod
+    def make_key(mode, title):
+        """Get the store key of an article"""
+        return '{}:{}'.format(mode, normalise_title(title))
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, key, tokens):
+        """Count the vocabulary words of an article's tokens and store them"""
+        word_ids = self.word_ids
+        counter = Counter(filter(word_ids.__contains__, map(str.lower, tokens)))
+        ids = np.array([word_ids[word] for word in counter], dtype=ID_TYPE)
+        counts = np.array(list(counter.values()), dtype=COUNT_TYPE)
+
+        with self.lock:
+            if key in self.index:
+                return
+            start = self.data_size()
+            # From the files themselves, in case an earlier add didn't finish.
+            with open(self.ids_path, 'ab') as f:
+                f.write(ids.tobytes())
+            with open(self.counts_path, 'ab') as f:
+                f.write(counts.tobytes())
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write('{}\t{}\t{}\n'.format(key, start, len(ids)))
+            self.index[key] = (start, len(ids))
+
+    def vector(self, key):
+        """Return the (ids, counts) arrays of an article"""
+        with self.lock:
+            start, length = self.index[key]
+            if length == 0:
+                return np.zeros(0, ID_TYPE), np.zeros(0, COUNT_TYPE)
+            if self.ids is None or len(self.ids) < start + length:
+                # Remap to see everything appended since last time.
+                self.ids = np.memmap(self.ids_path, dtype=ID_TYPE, mode='r')
+                self.counts = np.memmap(self.counts_path, dtype=COUNT_TYPE, mode='r')
+            return self.ids[start:start + length], self.counts[start:start + length]
+
+    def board_counts(self, vector, index):
+        """Count the board words in a stored article"""
+        ids, counts = vector
+        board_ids = [self.word_ids[word] for word in index.tiles if word in self.word_ids]
+        found = np.flatnonzero(np.isin(ids, board_ids))
+        return Counter({self.words[ids[i]]: int(counts[i]) for i in found})
@@ -0,0 +1,210 @@
+"""
+Read articles from an offline Wikipedia dump.
+
+Works with the pages-articles-multistream.xml.bz2 dumps, which are many
+bz2 streams of 100 pages each concatenated together. An index of
+title -> (stream offset, page position) lets a lookup decompress just the
+one stream holding the page instead of scanning the whole dump.
+
+Build the index once with:
+
+    python wiki_dump.py enwiki-latest-pages-articles-multistream.xml.bz2
+"""
+
+import bz2
+import hashlib
+import html
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import xml.etree.ElementTree as ET
+
+
+HEADER = struct.Struct('>4sHI')
+RECORD = struct.Struct('>QQH')
+# Title hash, stream offset, page position within the stream.
+MAGIC = b'WBIX'
+VERSION = 1
+
+TITLE = re.compile(rb'<title>(.*?)</title>')
+READ_SIZE = 1024 * 1024
+
+
+def normalise_title(title):
+    """Reduce a page title to the form used in the index"""
+    return ' '.join(title.replace('_', ' ').split()).lower()
+
+
+def title_hash(title):
+    """Hash a normalised page title to 64 bits"""
+    key = normalise_title(title).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+def iter_streams(f):
+    """Yield (offset, decompressed data) for each bz2 stream in a file"""
+    offset = 0
+    # Start of the current stream.
+    position = 0
+    # Bytes of the file fed to decompressors so far.
+    decompressor = bz2.BZ2Decompressor()
+    parts = []
+    pending = b''
+    while True:
+        data = pending or f.read(READ_SIZE)
+        pending = b''
+        if not data:
+            break
+        parts.append(decompressor.decompress(data))
+        position += len(data)
+        if decompressor.eof:
+            unused = decompressor.unused_data
+            position -= len(unused)
+            yield offset, b''.join(parts)
+            offset = position
+            decompressor = bz2.BZ2Decompressor()
+            parts = []
+            pending = unused
+
+
+def build_index(dump_path, index_path):
+    """Scan a multistream dump and write its title index"""
+    records = []
+    with open(dump_path, 'rb') as f:
+        for offset, data in iter_streams(f):
+            for position, match in enumerate(TITLE.finditer(data)):
+                title = html.unescape(match.group(1).decode('utf-8'))
+                records.append((title_hash(title), offset, position))
+    records.sort()
+
+    temp = index_path + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        for record in records:
+            f.write(RECORD.pack(*record))
+    os.replace(temp, index_path)
+    return len(records)
+
+
+def write_dump(dump_path, pages, pages_per_stream=100):
+    """Write (title, wikitext) pairs as a multistream dump"""
+    def page_xml(title, text):
+        page = ET.Element('page')
+        ET.SubElement(page, 'title').text = title
+        ET.SubElement(page, 'ns').text = '0'
+        match = re.match(r'\s*#redirect\s*:?\s*\[\[([^\]|#]+)', text, re.I)
+        if match:
+            ET.SubElement(page, 'redirect', title=match.group(1).strip())
+        revision = ET.SubElement(page, 'revision')
+        ET.SubElement(revision, 'text', {'xml:space': 'preserve'}).text = text
+        return ET.tostring(page, encoding='unicode') + '\n'
+
+    pages = list(pages)
+    with open(dump_path, 'wb') as f:
+        f.write(bz2.compress(b'<mediawiki xml:lang="en">\n<siteinfo></siteinfo>\n'))
+        for start in range(0, len(pages), pages_per_stream):
+            chunk = ''.join(page_xml(title, text)
+                            for title, text in pages[start:start + pages_per_stream])
+            f.write(bz2.compress(chunk.encode('utf-8')))
+        f.write(bz2.compress(b'</mediawiki>\n'))
+
+
+class WikiDump:
+    """Look up articles in a multistream dump using its title index."""
+
+    def __init__(self, dump_path, index_path=None):
+        """Initialise the parameters"""
+        self.dump_path = dump_path
+        self.index_path = index_path or dump_path + '.idx'
+        if not os.path.exists(self.index_path):
+            build_index(self.dump_path, self.index_path)
+
+        with open(self.index_path, 'rb') as f:
+            self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.index)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('{} is not a dump index'.format(self.index_path))
+
+        self.dump = open(dump_path, 'rb')
+        self.lock = threading.Lock()
+        self.last_stream = (None, None)
+        # The most recently decompressed stream, pages are often nearby.
+
+    def close(self):
+        """Close the dump and index files"""
+        self.index.close()
+        self.dump.close()
+
+    def record(self, i):
+        """Read one index record"""
+        return RECORD.unpack_from(self.index, HEADER.size + i * RECORD.size)
+
+    def locate(self, title):
+        """Return the (offset, position) of every page with the title's hash"""
+        target = title_hash(title)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.record(middle)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self.count:
+            key, offset, position = self.record(low)
+            if key != target:
+                break
+            found.append((offset, position))
+            low += 1
+        return found
+
+    def read_stream(self, offset):
+        """Decompress the stream starting at an offset"""
+        with self.lock:
+            if self.last_stream[0] == offset:
+                return self.last_stream[1]
+            self.dump.seek(offset)
+            decompressor = bz2.BZ2Decompressor()
+            parts = []
+            while not decompressor.eof:
+                data = self.dump.read(64 * 1024)
+                if not data:
+                    break
+                parts.append(decompressor.decompress(data))
+            pages = ET.fromstring(b'<pages>' + b''.join(parts) + b'</pages>')
+            self.last_stream = (offset, pages)
+            return pages
+
+    def find_page(self, title):
+        """Return the page element for a title, or None"""
+        key = normalise_title(title)
+        exact = ' '.join(title.replace('_', ' ').split())
+        matches = []
+        for offset, position in self.locate(title):
+            page = self.read_stream(offset)[position]
+            page_title = page.findtext('title')
+            if page_title == exact or page_title == exact[:1].upper() + exact[1:]:
+                return page
+            if normalise_title(page_title) == key:
+                matches.append(page)
+                # Titles differing only in case, e.g. Ice and ICE.
+        return matches[0] if matches else None
+
+    def get_page(self, title, max_redirects=3):
+        """Return the wikitext of an article"""
+        page = self.find_page(title)
+        if page is None:
+            raise KeyError(title)
+        redirect = page.find('redirect')
+        if redirect is not None and max_redirects > 0:
+            return self.get_page(redirect.get('title'), max_redirects - 1)
+        return page.findtext('revision/text') or ''
+
+
+if __name__ == '__main__':
+    dump = sys.argv[1]
+    count = build_index(dump, dump + '.idx')
+    print('Indexed {} pages'.format(count))
@@ -0,0 +1,85 @@
+"""Turn MediaWiki source into plain article text."""
+
+import html
+import re
+
+
+COMMENT = re.compile(r'<!--.*?-->', re.S)
+REF = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.S | re.I)
+HIDDEN = re.compile(r'<(math|gallery|timeline|score|syntaxhighlight|nowiki)[^>]*>.*?</\1>',
+                    re.S | re.I)
+TEMPLATE = re.compile(r'\{\{[^{}]*\}\}')
+# Innermost templates, removed repeatedly to handle nesting.
+MEDIA_LINK = re.compile(r'\[\[(?:file|image|category|media|[a-z]{2,3}(?:-[a-z]+)?):[^\[\]]*\]\]',
+                        re.I)
+LINK = re.compile(r'\[\[(?:[^\[\]|]*\|)?([^\[\]]*)\]\]')
+EXTERNAL_LINK = re.compile(r'\[(?:https?:)?//[^\s\]]*\s*([^\]]*)\]')
+BARE_URL = re.compile(r'https?://\S+')
+TAG = re.compile(r'</?[a-z][^>]*>', re.I)
+QUOTES = re.compile(r"'{2,}")
+HEADING = re.compile(r'^(=+)\s*(.*?)\s*\1\s*$', re.M)
+MAGIC_WORD = re.compile(r'__[A-Z]+__')
+REDIRECT = re.compile(r'^\s*#redirect\s*:?\s*\[\[([^\]|#]+)', re.I)
+
+
+def redirect_target(source):
+    """Return the page a redirect points to, or None"""
+    match = REDIRECT.match(source)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def remove_nested(pattern, text):
+    """Remove innermost matches until there are none left"""
+    while True:
+        text, count = pattern.subn('', text)
+        if count == 0:
+            return text
+
+
+def clean_table_line(line):
+    """Keep only the cell text from a line of table markup"""
+    stripped = line.lstrip()
+    if stripped.startswith(('{|', '|}', '|-', '|+')):
+        return ''
+    if not stripped.startswith(('|', '!')):
+        return line
+    cells = re.split(r'\|\||!!', stripped[1:])
+    text = []
+    for cell in cells:
+        # Drop "style=... |" cell attributes.
+        attrs, bar, content = cell.partition('|')
+        if bar and '=' in attrs:
+            cell = content
+        text.append(cell.strip())
+    return ' '.join(text)
+
+
+def clean_wikitext(source):
+    """Strip markup from wikitext, leaving the readable text"""
+    text = COMMENT.sub('', source)
+    text = REF.sub('', text)
+    text = HIDDEN.sub('', text)
+    text = remove_nested(TEMPLATE, text)
+    # Infoboxes, navboxes and citations.
+
+    text = '\n'.join(clean_table_line(line) for line in text.split('\n'))
+
+    while True:
+        # Strip links from the inside out, so nested [[File:...]] captions go.
+        new = LINK.sub(r'\1', MEDIA_LINK.sub('', text))
+        if new == text:
+            break
+        text = new
+    text = EXTERNAL_LINK.sub(r'\1', text)
+    text = BARE_URL.sub('', text)
+
+    text = TAG.sub('', text)
+    text = QUOTES.sub('', text)
+    text = HEADING.sub(r'\2', text)
+    text = MAGIC_WORD.sub('', text)
+    text = re.sub(r'^[*#:;]+\s*', '', text, flags=re.M)
+    # List and indent markers.
+
+    return html.unescape(text)
@@ -1,4 +1,5 @@
-import numpy.random as rn
+import functools
+
 import numpy as np
 
 
@@ -11,29 +12,70 @@ def get_word_list(file_name):
 
     return words_list
 
-class TargetWord:
+
+@functools.lru_cache(maxsize=4)
+def prepare_words(word_list):
+    """Lower case the words and drop blanks and repeats, shared between pools"""
+    words = list(dict.fromkeys(word.lower() for word in word_list if word))
+    return np.array(words, dtype=object), {word: i for i, word in enumerate(words)}
+
+
+class WordPool:
     """
-    Generate a target word and score range.
+    Draw words at random without replacement.
+
+    The words still available are kept at the front of an array. Drawing
+    swaps a random available word with the last available one and shrinks
+    the available part by one; putting a word back swaps it to just after
+    the end and grows it again. Both are O(1), no matter how full the board
+    is, and the random numbers all come from one Generator so a game can be
+    repeated from its seed.
     """
 
-    def __init__(self, word_list):
+    def __init__(self, word_list, seed=None, rng=None):
         """Initialise the parameters"""
-        self.word = None
-        self.upper = None
-        self.word_list = word_list
+        words, self.start_positions = prepare_words(tuple(word_list))
+        self.words = words.copy()
+        self.positions = {}
+        # Only words that have been moved, the rest are where they started.
+        self.available = len(words)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
 
-    def word_gen(self):
-        """Generate word from dictionary"""
+    def __len__(self):
+        return self.available
 
-        selected_int = rn.randint(0, high=len(self.word_list))
-        selected_word = self.word_list[selected_int]
+    def position(self, word):
+        """Where a word is in the array, or None"""
+        position = self.positions.get(word)
+        if position is None:
+            position = self.start_positions.get(word)
+        return position
 
-        self.word = selected_word
+    def __contains__(self, word):
+        position = self.position(word)
+        return position is not None and position < self.available
 
+    def swap(self, i, j):
+        """Swap two words in the array"""
+        words = self.words
+        words[i], words[j] = words[j], words[i]
+        self.positions[words[i]] = i
+        self.positions[words[j]] = j
 
-    def range_gen(self, mode=0):
-        """Generate acceptable range for word"""
-        difficulty = [7, 5, 3]
-        # First = easy, second = medium, third = hard.
+    def draw(self):
+        """Take a random word out of the pool"""
+        if self.available == 0:
+            raise ValueError('No words left in the pool')
+        i = int(self.rng.integers(self.available))
+        self.available -= 1
+        self.swap(i, self.available)
+        return self.words[self.available]
 
-        self.upper = difficulty[mode]
\ No newline at end of file
+    def put_back(self, word):
+        """Return a drawn word to the pool"""
+        position = self.position(word)
+        if position is None or position < self.available:
+            return
+            # Not one of the words, or never drawn.
+        self.swap(position, self.available)
+        self.available += 1